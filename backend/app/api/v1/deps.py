@@ -2,18 +2,32 @@ from fastapi import Depends, HTTPException, status, WebSocket, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from clerk_backend_api import Clerk
 from app.core.config import settings
-from app.services.user_service import UserService
+from app.core.cache import TTLCache
+from app.services.user_service import COACH_ORG_ROLES, UserService, get_primary_email
 from app.services.clerk_organization_service import ClerkOrganizationService
 from app.services.analysis_service import AnalysisService
 from app.repositories.baseline_repository import BaselineRepository
 from app.repositories.document_repository import DocumentRepository
+from app.repositories.journey.reflection_repository import ReflectionSourceRepository
+from app.repositories.journey.insight_repository import InsightRepository
+from app.services.journey.file_storage_service import FileStorageService
+from app.services.clerk_invitation_service import ClerkInvitationService
+from app.services.profile_service import ProfileService
+from app.services.entry_service import EntryService
+from app.services.freemium_service import FreemiumService
+from app.services.text_extraction_service import TextExtractionService
 from app.middleware.session_validation import validate_user_session
+from app.models.profile import Profile
 import logging
 import jwt
 from jwt import PyJWKClient
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError, InvalidSignatureError
 import httpx
 import asyncio
+import copy
+import hashlib
+import itertools
+import time
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
@@ -22,6 +36,33 @@ logger = logging.getLogger(__name__)
 # Security scheme
 security = HTTPBearer()
 
+# Authenticated user info keyed by a hash of the bearer token. A page load
+# sends several API calls with the same token, and each would otherwise
+# re-verify the JWT and re-fetch organization roles from Clerk. Entries
+# never outlive the token itself.
+USER_INFO_CACHE_TTL_SECONDS = 30
+_user_info_cache = TTLCache(maxsize=10_000, ttl_seconds=USER_INFO_CACHE_TTL_SECONDS)
+# Per-user generations. Entries remember the generation they were fetched
+# under, so a role change drops one user's entries without having to find
+# them by token, and a lookup that overlaps the change is never reused.
+# Generations are drawn from one global counter, so a user's generation never
+# repeats, and they only need to outlive the entries they invalidate; keeping
+# them for twice the entry TTL bounds the map by recently changed users.
+_user_info_generations = TTLCache(maxsize=10_000, ttl_seconds=2 * USER_INFO_CACHE_TTL_SECONDS)
+_next_user_info_generation = itertools.count(1)
+
+
+def _user_info_generation(clerk_user_id: str) -> int:
+    return _user_info_generations.get(clerk_user_id) or 0
+
+
+def invalidate_user_info_cache(clerk_user_id: Optional[str] = None) -> None:
+    """Drop cached token lookups for one user, or for everyone if no user is given"""
+    if clerk_user_id:
+        _user_info_generations.set(clerk_user_id, next(_next_user_info_generation))
+    else:
+        _user_info_cache.clear()
+
 # JWKS Cache for JWT verification
 class JWKSCache:
     def __init__(self):
@@ -186,6 +227,15 @@ async def get_current_user_clerk_id(
     try:
         # Securely verify the JWT token with Clerk's JWKS
         token = credentials.credentials
+        token_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = _user_info_cache.get(token_key)
+        if cached is not None:
+            expires_at, generation, cached_user_info = cached
+            current_generation = _user_info_generation(cached_user_info["clerk_user_id"])
+            if expires_at > time.time() and generation == current_generation:
+                # Callers may modify the nested role data; keep the cached copy intact
+                return copy.deepcopy(cached_user_info)
+            _user_info_cache.invalidate(token_key)
         
         try:
             # Use secure JWT verification with JWKS
@@ -199,6 +249,11 @@ async def get_current_user_clerk_id(
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             
+            generation = _user_info_generation(clerk_user_id)
+            first_name = ""
+            last_name = ""
+            email = None
+            
             # Fetch real-time organization roles from Clerk to ensure data is fresh
             clerk_org_service = ClerkOrganizationService()
             try:
@@ -208,20 +263,21 @@ async def get_current_user_clerk_id(
                 }
                 
                 # Extract user's first and last name from organization data
-                first_name = ""
-                last_name = ""
                 if user_orgs:
                     public_user_data = user_orgs[0].get("public_user_data", {})
                     first_name = public_user_data.get("first_name", "")
                     last_name = public_user_data.get("last_name", "")
+                    # Clerk's identifier is the user's primary email address
+                    email = public_user_data.get("identifier")
 
                 # Determine primary_role based on the most privileged role found
                 is_coach_or_admin = any(
-                    org["role"] in ["admin", "coach"] for org in user_orgs
+                    org["role"] in COACH_ORG_ROLES for org in user_orgs
                 )
                 
                 jwt_primary_role = decoded_token.get("publicMetadata", {}).get("primary_role", "member")
                 primary_role = "coach" if is_coach_or_admin else jwt_primary_role
+                roles_from_clerk = True
                 logger.info(f"✅ Successfully fetched real-time roles from Clerk for user {clerk_user_id}.")
 
             except Exception as e:
@@ -230,6 +286,7 @@ async def get_current_user_clerk_id(
                 public_metadata = decoded_token.get("publicMetadata", {})
                 primary_role = public_metadata.get("primary_role", "member")
                 organization_roles = public_metadata.get("organization_roles", {})
+                roles_from_clerk = False
                 logger.warning(f"⚠️ Using potentially stale roles from JWT for user {clerk_user_id}.")
 
             logger.info(f"🔍 Authenticated user with Clerk ID: {clerk_user_id}")
@@ -253,13 +310,18 @@ async def get_current_user_clerk_id(
                 # Continue with authentication even if validation fails
             
             # The user is authenticated by Clerk, no need to check our database.
-            return {
+            user_info = {
                 "clerk_user_id": clerk_user_id,
                 "primary_role": primary_role,
                 "organization_roles": organization_roles,
                 "first_name": first_name,
-                "last_name": last_name
+                "last_name": last_name,
+                "email": email
             }
+            # JWT fallback roles may be stale, so only Clerk's answer is reused
+            if roles_from_clerk and "exp" in decoded_token:
+                _user_info_cache.set(token_key, (decoded_token["exp"], generation, copy.deepcopy(user_info)))
+            return user_info
             
         except HTTPException:
             # Re-raise HTTP exceptions from verify_clerk_jwt
@@ -276,6 +338,13 @@ async def get_current_user_clerk_id(
         )
 
 
+async def get_current_user_id(
+    user_info: Dict[str, Any] = Depends(get_current_user_clerk_id)
+) -> str:
+    """Return just the authenticated user's Clerk ID"""
+    return user_info["clerk_user_id"]
+
+
 # Optional dependency for endpoints that may or may not require auth
 async def get_current_user_clerk_id_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -300,6 +369,65 @@ def get_analysis_service() -> AnalysisService:
     return AnalysisService(baseline_repository, document_repository)
 
 
+def get_file_storage(request: Request) -> FileStorageService:
+    """Get the app-wide FileStorageService created at startup"""
+    return request.app.state.file_storage
+
+
+def get_reflection_repository(request: Request) -> ReflectionSourceRepository:
+    """Get the app-wide ReflectionSourceRepository created at startup"""
+    return request.app.state.reflection_repo
+
+
+def get_insight_repository(request: Request) -> InsightRepository:
+    """Get the app-wide InsightRepository created at startup"""
+    return request.app.state.insight_repo
+
+
+def get_user_service(request: Request) -> UserService:
+    """Get the app-wide UserService created at startup"""
+    return request.app.state.user_service
+
+
+def get_profile_service(request: Request) -> ProfileService:
+    """Get the app-wide ProfileService created at startup"""
+    return request.app.state.profile_service
+
+
+async def require_coach_profile(
+    clerk_user_id: str = Depends(get_current_user_id),
+    profile_service: ProfileService = Depends(get_profile_service)
+) -> Profile:
+    """Require the current user to have a coach profile and return it"""
+    coach_profile = await profile_service.get_profile_by_clerk_id(clerk_user_id)
+    if not coach_profile or not coach_profile.coach_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Coach profile required to send invitations"
+        )
+    return coach_profile
+
+
+def get_invitation_service(request: Request) -> ClerkInvitationService:
+    """Get the app-wide ClerkInvitationService created at startup"""
+    return request.app.state.invitation_service
+
+
+def get_entry_service(request: Request) -> EntryService:
+    """Get the app-wide EntryService created at startup"""
+    return request.app.state.entry_service
+
+
+def get_freemium_service(request: Request) -> FreemiumService:
+    """Get the app-wide FreemiumService created at startup"""
+    return request.app.state.freemium_service
+
+
+def get_text_extraction_service(request: Request) -> TextExtractionService:
+    """Get the app-wide TextExtractionService created at startup"""
+    return request.app.state.text_extraction_service
+
+
 async def get_current_user_websocket(websocket: WebSocket, token: str = Query(...)):
     """Get current user from WebSocket connection with token as query parameter using secure JWT verification"""
     logger.info(f"=== get_current_user_websocket called ===")
@@ -324,14 +452,6 @@ async def get_current_user_websocket(websocket: WebSocket, token: str = Query(..
             logger.error(f"User not found for clerk_id: {clerk_user_id}")
             raise HTTPException(status_code=401, detail="User not found")
 
-        def get_primary_email(user):
-            if not user or not user.email_addresses:
-                return None
-            for email in user.email_addresses:
-                if email.id == user.primary_email_address_id:
-                    return email.email_address
-            return user.email_addresses[0].email_address
-        
         logger.info(f"✅ WebSocket User {clerk_user_id} found via Clerk")
         
         # Extract role information from JWT token
@@ -408,7 +528,7 @@ async def org_required(
         org_role_info = organization_roles[org_id]
         org_role = org_role_info.get("role") if isinstance(org_role_info, dict) else org_role_info
         
-        if org_role not in ["coach", "admin"]:
+        if org_role not in COACH_ORG_ROLES:
             logger.warning(f"🔒 Access denied: User {clerk_user_id} has role '{org_role}' in org {org_id}, requires coach or admin")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any
 from app.api.v1.deps import get_current_user_clerk_id
+from app.core.http_cache import etag_json_response
 from app.repositories.coaching_interest_repository import CoachingInterestRepository
 from app.models.coaching_interest import CoachingInterest
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 async def require_admin_role(
@@ -52,8 +54,9 @@ async def require_admin_role(
 
 @router.get("/coaching-interest/", response_model=List[CoachingInterest])
 async def get_all_coaching_interest_submissions(
+    request: Request,
     user_info: Dict[str, Any] = Depends(require_admin_role)
-) -> List[CoachingInterest]:
+) -> Response:
     """
     Get all coaching interest submissions (admin only).
     
@@ -69,7 +72,13 @@ async def get_all_coaching_interest_submissions(
         submissions = await coaching_interest_repo.get_all()
         
         logger.info(f"✅ Successfully retrieved {len(submissions)} coaching interest submissions for admin")
-        return submissions
+        # Serialize once here; returning a Response skips FastAPI's response_model
+        # re-validation and jsonable_encoder pass. The dashboard revalidates on
+        # every poll, which is a bodiless 304 until a new submission
+        return etag_json_response(
+            request,
+            [submission.model_dump(mode="json", by_alias=True) for submission in submissions]
+        )
         
     except Exception as e:
         logger.error(f"❌ Error retrieving coaching interest submissions: {e}")
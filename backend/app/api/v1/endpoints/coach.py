@@ -3,12 +3,13 @@ from typing import List, Optional
 from app.models.coach_resource import CoachResource, CoachClientNote
 from app.repositories.coach_resource_repository import CoachResourceRepository
 from app.repositories.coaching_relationship_repository import CoachingRelationshipRepository
-from app.services.user_service import UserService
+from app.services.user_service import UserService, get_primary_email
 from app.repositories.profile_repository import ProfileRepository
 from app.repositories.entry_repository import EntryRepository
 from app.api.v1.deps import org_required
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -74,31 +75,35 @@ async def get_coach_clients(user_info: dict = Depends(org_required)):
         profile_repo = ProfileRepository()
         entry_repo = EntryRepository()
         
-        clients = []
+        # Get client user data, skipping clients Clerk no longer knows about
+        client_users = []
         for relationship in relationships:
-            # Get client user data
             client_user = user_service.get_user(relationship.client_user_id)
-            if not client_user:
-                continue
-                
-            def get_primary_email(user):
-                if not user or not user.email_addresses:
-                    return None
-                for email in user.email_addresses:
-                    if email.id == user.primary_email_address_id:
-                        return email.email_address
-                return user.email_addresses[0].email_address
-            
+            if client_user:
+                client_users.append((relationship, client_user))
+        
+        async def get_entry_stats(client_user_id: str):
+            return await asyncio.gather(
+                entry_repo.get_entries_count_by_user(client_user_id),
+                entry_repo.get_latest_entry_by_user(client_user_id)
+            )
+        
+        # Fetch all client profiles in one query and every client's entry
+        # stats concurrently instead of three round-trips per client
+        client_ids = [relationship.client_user_id for relationship, _ in client_users]
+        client_profiles, entry_stats = await asyncio.gather(
+            profile_repo.get_profiles_by_clerk_ids(client_ids),
+            asyncio.gather(*(get_entry_stats(client_id) for client_id in client_ids))
+        )
+        
+        clients = []
+        for (relationship, client_user), (entries_count, last_entry) in zip(client_users, entry_stats):
             client_email = get_primary_email(client_user)
 
             # Get client profile for name
-            client_profile = await profile_repo.get_profile_by_clerk_id(relationship.client_user_id)
+            client_profile = client_profiles.get(relationship.client_user_id)
             client_name = f"{client_profile.first_name} {client_profile.last_name}" if client_profile else client_email
             
-            # Get client entry stats
-            entries_count = await entry_repo.get_entries_count_by_user(relationship.client_user_id)
-            last_entry = await entry_repo.get_latest_entry_by_user(relationship.client_user_id)
-            
             clients.append(CoachClient(
                 id=relationship.client_user_id,
                 name=client_name,
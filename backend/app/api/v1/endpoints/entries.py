@@ -1,6 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
-from app.api.v1.deps import org_optional
+from tempfile import SpooledTemporaryFile
+from app.api.v1.deps import (
+    org_optional,
+    get_entry_service,
+    get_freemium_service,
+    get_text_extraction_service
+)
 from app.schemas.entry import (
     EntryCreateRequest,
     EntryResponse,
@@ -16,12 +23,35 @@ from app.models.entry import EntryType
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+MAX_ENTRY_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+ENTRY_UPLOAD_CHUNK_SIZE = 64 * 1024
+# Uploads larger than this roll over from memory to a temporary file
+ENTRY_UPLOAD_SPOOL_SIZE = 1 * 1024 * 1024
+_ALLOWED_UPLOAD_TYPES = frozenset({"text/plain", "application/pdf"})
+_ALLOWED_UPLOAD_TYPES_MESSAGE = f"Unsupported file type. Allowed types: {', '.join(sorted(_ALLOWED_UPLOAD_TYPES))}"
 
-def _convert_to_response(entry) -> EntryResponse:
-    """Convert Entry model to response format"""
-    return EntryResponse(
+
+# Analysis fields copied onto the detail response in a single model_dump pass
+_DETAIL_INSIGHT_FIELDS = frozenset({
+    "transcript_content",
+    "celebrations",
+    "intentions",
+    "client_discoveries",
+    "goal_progress",
+    "coaching_presence",
+    "powerful_questions",
+    "action_items",
+    "emotional_shifts",
+    "values_beliefs",
+    "communication_patterns",
+})
+
+
+def _entry_response_fields(entry) -> dict:
+    """Build the summary fields shared by list and detail responses"""
+    return dict(
         id=str(entry.id),
         entry_type=entry.entry_type.value,
         title=entry.title or "Untitled Entry",
@@ -40,31 +70,28 @@ def _convert_to_response(entry) -> EntryResponse:
     )
 
 
+def _convert_to_response(entry) -> EntryResponse:
+    """Convert Entry model to response format"""
+    return EntryResponse(**_entry_response_fields(entry))
+
+
 def _convert_to_detail_response(entry) -> EntryDetailResponse:
     """Convert Entry model to detailed response format"""
-    base_response = _convert_to_response(entry)
-    
-    return EntryDetailResponse(
-        **base_response.model_dump(),
-        content=entry.content,
-        transcript_content=entry.transcript_content,
-        celebrations=[c.model_dump() for c in entry.celebrations],
-        intentions=[i.model_dump() for i in entry.intentions],
-        client_discoveries=[d.model_dump() for d in entry.client_discoveries],
-        goal_progress=[g.model_dump() for g in entry.goal_progress],
-        coaching_presence=entry.coaching_presence.model_dump() if entry.coaching_presence else None,
-        powerful_questions=[q.model_dump() for q in entry.powerful_questions],
-        action_items=[a.model_dump() for a in entry.action_items],
-        emotional_shifts=[e.model_dump() for e in entry.emotional_shifts],
-        values_beliefs=[v.model_dump() for v in entry.values_beliefs],
-        communication_patterns=entry.communication_patterns.model_dump() if entry.communication_patterns else None
-    )
+    fields = _entry_response_fields(entry)
+    # One serializer traversal for all nested analysis models instead of a
+    # model_dump() call per list element
+    fields.update(entry.model_dump(include=_DETAIL_INSIGHT_FIELDS))
+    fields["content"] = entry.content
+
+    return EntryDetailResponse(**fields)
 
 
 @router.post("/", response_model=EntryResponse)
 async def create_entry(
     request: EntryCreateRequest,
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    entry_service: EntryService = Depends(get_entry_service),
+    freemium_service: FreemiumService = Depends(get_freemium_service)
 ):
     """
     Create a new entry (session or fresh thought).
@@ -78,7 +105,6 @@ async def create_entry(
         logger.info(f"user: {current_user_id}, type: {request.entry_type}")
         
         # Check freemium limits
-        freemium_service = FreemiumService()
         can_create = await freemium_service.can_create_entry(current_user_id)
         
         if not can_create:
@@ -99,7 +125,6 @@ async def create_entry(
             )
         
         # Create entry
-        entry_service = EntryService()
         entry = await entry_service.create_entry(
             user_id=current_user_id,
             entry_type=request.entry_type,
@@ -134,7 +159,10 @@ async def create_entry_from_file(
     input_method: str = Form("upload"),
     title: Optional[str] = Form(None),
     file: UploadFile = File(...),
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    entry_service: EntryService = Depends(get_entry_service),
+    freemium_service: FreemiumService = Depends(get_freemium_service),
+    text_extraction_service: TextExtractionService = Depends(get_text_extraction_service)
 ):
     """
     Create a new entry from an uploaded file (supports PDF and text files).
@@ -157,7 +185,6 @@ async def create_entry_from_file(
             )
         
         # Check freemium limits
-        freemium_service = FreemiumService()
         can_create = await freemium_service.can_create_entry(current_user_id)
         
         if not can_create:
@@ -171,33 +198,34 @@ async def create_entry_from_file(
             )
         
         # Validate file type and size
-        allowed_types = ["text/plain", "application/pdf"]
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file type. Allowed types: {', '.join(allowed_types)}"
-            )
-        
-        # Check file size (5MB limit)
-        max_size = 5 * 1024 * 1024  # 5MB
-        file_content = await file.read()
-        if len(file_content) > max_size:
+        if file.content_type not in _ALLOWED_UPLOAD_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size must be less than 5MB"
+                detail=_ALLOWED_UPLOAD_TYPES_MESSAGE
             )
         
-        # Extract text from file
-        if file.content_type == "text/plain":
-            # For text files, decode directly
-            content = file_content.decode('utf-8')
-        else:
-            # For PDF files, use text extraction service
-            text_extraction_service = TextExtractionService()
-            content = await text_extraction_service.extract_text_from_bytes(
-                file_content,
-                file.filename or "uploaded_file.pdf"
-            )
+        # Stream the upload into a spool, enforcing the size cap as chunks arrive
+        with SpooledTemporaryFile(max_size=ENTRY_UPLOAD_SPOOL_SIZE) as spool:
+            total_size = 0
+            while chunk := await file.read(ENTRY_UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > MAX_ENTRY_FILE_SIZE:
+                    # Same status and message as UploadSizeLimitMiddleware
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File size must be less than {MAX_ENTRY_FILE_SIZE // (1024 * 1024)}MB"
+                    )
+                spool.write(chunk)
+            
+            # Extract text from file
+            try:
+                # The validated content type picks the extractor, not the filename
+                content = await text_extraction_service.extract_text_from_fileobj(spool, file.content_type)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
         
         # Validate content length
         if len(content.strip()) < 10:
@@ -207,7 +235,6 @@ async def create_entry_from_file(
             )
         
         # Create entry
-        entry_service = EntryService()
         entry = await entry_service.create_entry(
             user_id=current_user_id,
             entry_type=parsed_entry_type,
@@ -240,7 +267,9 @@ async def get_entries(
     entry_type: Optional[str] = None,
     limit: int = 20,
     offset: int = 0,
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    entry_service: EntryService = Depends(get_entry_service),
+    freemium_service: FreemiumService = Depends(get_freemium_service)
 ):
     """
     Get entries for the current user with optional filtering.
@@ -264,7 +293,6 @@ async def get_entries(
                 )
         
         # Get entries
-        entry_service = EntryService()
         entries = await entry_service.get_entries(
             user_id=current_user_id,
             entry_type=parsed_entry_type,
@@ -273,7 +301,6 @@ async def get_entries(
         )
         
         # Get total count and freemium status
-        freemium_service = FreemiumService()
         freemium_status = await freemium_service.get_freemium_status(current_user_id)
         
         # Check if results are limited due to freemium
@@ -305,7 +332,8 @@ async def get_entries(
 @router.get("/{entry_id}", response_model=EntryDetailResponse)
 async def get_entry_detail(
     entry_id: str,
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    entry_service: EntryService = Depends(get_entry_service)
 ):
     """
     Get detailed view of a specific entry.
@@ -317,7 +345,6 @@ async def get_entry_detail(
         logger.info(f"=== get_entry_detail called ===")
         logger.info(f"user: {current_user_id}, entry: {entry_id}")
         
-        entry_service = EntryService()
         entry = await entry_service.get_entry_insights(entry_id, current_user_id)
         
         if not entry:
@@ -345,7 +372,8 @@ async def get_entry_detail(
 async def accept_detected_goals(
     entry_id: str,
     request: AcceptGoalsRequest,
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    entry_service: EntryService = Depends(get_entry_service)
 ):
     """
     Accept detected goals from an entry.
@@ -355,7 +383,6 @@ async def accept_detected_goals(
         logger.info(f"=== accept_detected_goals called ===")
         logger.info(f"entry: {entry_id}, user: {current_user_id}")
         
-        entry_service = EntryService()
         success = await entry_service.accept_detected_goals(
             entry_id=entry_id,
             user_id=current_user_id,
@@ -383,7 +410,8 @@ async def accept_detected_goals(
 
 @router.get("/freemium/status", response_model=FreemiumStatusResponse)
 async def get_freemium_status(
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    freemium_service: FreemiumService = Depends(get_freemium_service)
 ):
     """
     Get freemium status for entry creation.
@@ -393,7 +421,6 @@ async def get_freemium_status(
         logger.info(f"=== get_freemium_status called ===")
         logger.info(f"user: {current_user_id}")
         
-        freemium_service = FreemiumService()
         status_data = await freemium_service.get_freemium_status(current_user_id)
         
         response = FreemiumStatusResponse(
@@ -4,11 +4,12 @@ Journey System API Endpoints
 This module contains FastAPI routes for the Journey System functionality.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 import logging
 
-from app.api.v1.deps import org_optional
+from app.api.v1.deps import org_optional, get_reflection_repository, get_insight_repository
 from app.schemas.journey import (
     ReflectionCreateRequest, ReflectionResponse, ReflectionWithInsightsResponse,
     InsightCreateRequest, InsightResponse, JourneyFeedResponse, JourneyFeedItem
@@ -16,16 +17,21 @@ from app.schemas.journey import (
 from app.services.journey.journey_service import JourneyService
 from app.repositories.journey.reflection_repository import ReflectionSourceRepository
 from app.repositories.journey.insight_repository import InsightRepository
+from app.db.redis import cache_get, cache_set, get_cache_version, JOURNEY_CACHE_NAMESPACE
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# Cached feed pages expire after this many seconds even without a write
+FEED_CACHE_TTL_SECONDS = 30
 
-def get_journey_service() -> JourneyService:
-    """Dependency to get JourneyService instance"""
-    reflection_repo = ReflectionSourceRepository()
-    insight_repo = InsightRepository()
+
+def get_journey_service(
+    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository),
+    insight_repo: InsightRepository = Depends(get_insight_repository)
+) -> JourneyService:
+    """Dependency to get JourneyService instance backed by the shared repositories"""
     return JourneyService(reflection_repo, insight_repo)
 
 
@@ -43,18 +49,29 @@ async def get_journey_feed(
     
     This endpoint returns a paginated feed of the user's journey items (reflections and insights)
     sorted by creation date in descending order (most recent first).
+    
+    Serialized pages are cached in Redis (when configured). The cache key
+    includes a per-user version that is bumped on every reflection or insight
+    write, so stale pages are never served after a change.
     """
     try:
         user_id = user_info['clerk_user_id']
         logger.info(f"Getting journey feed for user: {user_id} (skip={skip}, limit={limit})")
         
+        version = await get_cache_version(JOURNEY_CACHE_NAMESPACE, user_id)
+        cache_key = f"{JOURNEY_CACHE_NAMESPACE}:feed:{user_id}:{version}:{skip}:{limit}"
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
         # Get the feed items from the service
         feed_items_data = await journey_service.get_user_journey_feed(user_id, skip, limit)
         
-        # Convert to response format
+        # Convert to response format; items come from validated models, so
+        # they are constructed without re-running field validation
         feed_items = []
         for item_data in feed_items_data:
-            feed_item = JourneyFeedItem(
+            feed_item = JourneyFeedItem.model_construct(
                 type=item_data["type"],
                 id=item_data["id"],
                 title=item_data["title"],
@@ -81,12 +98,15 @@ async def get_journey_feed(
             )
             feed_items.append(feed_item)
         
-        return JourneyFeedResponse(
+        feed_response = JourneyFeedResponse(
             items=feed_items,
             total_count=len(feed_items),
             skip=skip,
             limit=limit
         )
+        payload = feed_response.model_dump_json()
+        await cache_set(cache_key, payload, FEED_CACHE_TTL_SECONDS)
+        return Response(content=payload, media_type="application/json")
         
     except Exception as e:
         logger.error(f"❌ Error getting journey feed: {e}")
@@ -3,7 +3,7 @@ from app.schemas.coaching_relationship import UserRelationshipsResponse
 from app.schemas.coaching_interest import CoachingInterestCreate
 from app.schemas.session import UserSessionSettingsUpdate
 from app.services.coaching_relationship_service import CoachingRelationshipService
-from app.services.user_service import UserService
+from app.services.user_service import UserService, get_primary_email
 from app.repositories.coaching_relationship_repository import CoachingRelationshipRepository
 from app.repositories.coaching_interest_repository import CoachingInterestRepository
 from app.api.v1.deps import org_optional
@@ -34,14 +34,6 @@ def convert_relationship_to_response(relationship, user_service: UserService):
     coach_user = user_service.get_user(relationship.coach_user_id)
     client_user = user_service.get_user(relationship.client_user_id)
     
-    def get_primary_email(user):
-        if not user or not user.email_addresses:
-            return None
-        for email in user.email_addresses:
-            if email.id == user.primary_email_address_id:
-                return email.email_address
-        return user.email_addresses[0].email_address
-
     return CoachingRelationshipResponse(
         id=str(relationship.id),
         coach_user_id=relationship.coach_user_id,
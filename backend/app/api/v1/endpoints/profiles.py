@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pymongo.errors import DuplicateKeyError
 from app.api.v1.deps import org_optional
+from app.core.http_cache import apply_private_cache_headers
 from app.services.profile_service import ProfileService
 from app.services.clerk_organization_service import ClerkOrganizationService
 from app.schemas.profile import (
@@ -49,7 +51,9 @@ async def create_coach_profile(
             "primary_organization_id": clerk_org["id"]
         }
         
-        created_profile = await profile_service.create_profile(clerk_user_id, profile_dict)
+        created_profile = await profile_service.create_profile(
+            clerk_user_id, profile_dict, email=user_info.get("email")
+        )
         
         # Get organization details for response
         org_response = OrganizationResponse(
@@ -75,6 +79,12 @@ async def create_coach_profile(
         
     except HTTPException:
         raise
+    except DuplicateKeyError:
+        # Lost a race with another create for the same user
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profile already exists"
+        )
     except Exception as e:
         logger.error(f"Error creating coach profile: {str(e)}")
         raise HTTPException(
@@ -143,6 +153,12 @@ async def create_client_profile(
         
     except HTTPException:
         raise
+    except DuplicateKeyError:
+        # Lost a race with another create for the same user
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profile already exists"
+        )
     except Exception as e:
         logger.error(f"Error creating client profile: {str(e)}")
         raise HTTPException(
@@ -153,6 +169,7 @@ async def create_client_profile(
 
 @router.get("/me", response_model=ProfileResponse)
 async def get_current_user_profile(
+    response: Response,
     user_info: dict = Depends(org_optional)
 ):
     """Get current user's profile with organization details"""
@@ -183,6 +200,7 @@ async def get_current_user_profile(
             except Exception as e:
                 logger.warning(f"Could not fetch organization details: {str(e)}")
         
+        apply_private_cache_headers(response)
         return ProfileResponse(
             id=str(profile.id),
             user_id=profile.user_id,
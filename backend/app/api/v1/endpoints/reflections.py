@@ -1,27 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, BackgroundTasks, Response, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pymongo.errors import DuplicateKeyError
+from typing import List, AsyncIterator
+import asyncio
 import logging
+import types
+import orjson
 from datetime import datetime
 
-from app.api.v1.deps import get_current_user_clerk_id
-from app.models.journey.reflection import ReflectionSource
-from app.models.journey.enums import DocumentType, ProcessingStatus
+from app.api.v1.deps import (
+    get_current_user_clerk_id, get_file_storage, get_reflection_repository
+)
+from app.models.journey.reflection import ReflectionSource, DocumentAnalysis
+from app.models.journey.insight import Insight
+from app.models.journey.enums import DocumentType, ProcessingStatus, CategoryType, ReviewStatus
 from app.repositories.journey.reflection_repository import ReflectionSourceRepository
 from app.repositories.journey.insight_repository import InsightRepository
 from app.services.journey.file_storage_service import FileStorageService
-from app.services.text_extraction_service import extract_text_from_file
+from app.services.text_extraction_service import extract_text_with_counts
 from app.services.journey.ai_processor import analyze_text_for_insights
-from app.schemas.journey import JourneyFeedResponse, JourneyFeedItem
+from app.schemas.journey import JourneyFeedResponse, JourneyFeedItem, ReflectionSourceResponse
 from app.db.mongodb import get_database
+from app.db.redis import cache_get, cache_set, get_cache_version, JOURNEY_CACHE_NAMESPACE
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-def get_reflection_repository() -> ReflectionSourceRepository:
-    """Dependency to get reflection repository with database connection."""
-    return ReflectionSourceRepository()
+# Characters of extracted text kept on the reflection document for list views
+CONTENT_EXCERPT_LENGTH = 500
 
-@router.get("/", response_model=List[ReflectionSource])
+# AI emoji category -> frontend key, in display order
+_CATEGORY_FRONTEND_KEYS = (
+    ("🪞 Understanding Myself", "understanding_myself"),
+    ("👥 Navigating Relationships", "navigating_relationships"),
+    ("💪 Optimizing Performance", "optimizing_performance"),
+    ("🎯 Making Progress", "making_progress"),
+)
+
+# AI emoji category -> stored insight category
+_CATEGORY_TYPES = types.MappingProxyType({
+    "🪞 Understanding Myself": CategoryType.PERSONAL_GROWTH,
+    "👥 Navigating Relationships": CategoryType.RELATIONSHIPS,
+    "💪 Optimizing Performance": CategoryType.GOALS_ACHIEVEMENT,
+    "🎯 Making Progress": CategoryType.CHALLENGES,
+})
+
+
+def _tag_slug(category_name: str) -> str:
+    """Turn an emoji category label into a tag, e.g. "🎯 Making Progress" -> "making_progress"."""
+    return category_name.partition(" ")[2].lower().replace(" ", "_")
+
+# AI emoji category -> insight tag
+_TAG_SLUGS = types.MappingProxyType({
+    ai_category: _tag_slug(ai_category) for ai_category, _ in _CATEGORY_FRONTEND_KEYS
+})
+
+# Cached read responses expire after this many seconds even without a write
+INSIGHTS_CACHE_TTL_SECONDS = 300
+FEED_CACHE_TTL_SECONDS = 30
+
+# Content types accepted by the reflection upload endpoint
+_ALLOWED_CONTENT_TYPES = frozenset({
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/msword",
+    "text/plain",
+})
+
+# Upload content type -> stored document type
+_DOCUMENT_TYPE_MAPPING = types.MappingProxyType({
+    "application/pdf": DocumentType.PDF,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DocumentType.DOCX,
+    "application/msword": DocumentType.DOC,
+    "text/plain": DocumentType.TXT,
+})
+
+@router.get("/", response_model=List[ReflectionSourceResponse])
 async def get_reflection_sources(
     user_info: dict = Depends(get_current_user_clerk_id),
     reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository)
@@ -29,9 +84,12 @@ async def get_reflection_sources(
     """
     Get all reflection documents for the currently authenticated user.
     
+    Uploaded documents store their text externally, so their `content` is
+    the stored excerpt here; GET /reflections/{id} returns the full text.
+    
     Returns:
-        List[ReflectionSource]: List of all reflection documents for the user.
-                               Returns empty list if no documents are found.
+        List[ReflectionSourceResponse]: List of all reflection documents for the user.
+                                        Returns empty list if no documents are found.
     """
     try:
         user_id = user_info['clerk_user_id']
@@ -39,6 +97,9 @@ async def get_reflection_sources(
         
         # Get all reflection documents for the user
         reflections = await reflection_repo.get_by_user_id(user_id)
+        for reflection in reflections:
+            if not reflection.content and reflection.content_excerpt:
+                reflection.content = reflection.content_excerpt
         
         logger.info(f"Successfully retrieved {len(reflections)} reflection sources for user: {user_id}")
         return reflections
@@ -50,187 +111,320 @@ async def get_reflection_sources(
             detail="An unexpected error occurred while retrieving reflection sources"
         )
 
-@router.post("/upload", response_model=ReflectionSource)
+@router.post("/upload", response_model=ReflectionSourceResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_reflection_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     user_info: dict = Depends(get_current_user_clerk_id),
-    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository)
+    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository),
+    file_storage_service: FileStorageService = Depends(get_file_storage)
 ):
     """
-    Upload a document, save it, extract text, and create a reflection source.
-    Complete end-to-end implementation with proper error handling.
+    Upload a document and create a pending reflection source.
+    
+    The file is saved and a stub record is stored before responding with 202.
+    Text extraction, AI analysis and insight creation run in a background task
+    that updates the record once processing finishes.
     """
     user_id = user_info['clerk_user_id']
     logger.info(f"Starting document upload for user: {user_id}, file: {file.filename}")
     
-    # Initialize services
-    file_storage_service = FileStorageService()
+    # Drop parameters such as "; charset=utf-8" and normalize case once
+    content_type = (file.content_type or "").split(";", 1)[0].strip().lower()
+    if content_type not in _ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file type: {file.content_type}"
+        )
     
     try:
         # 1. Save file using the proper method
-        file_path = file_storage_service.save_reflection_document(user_id, file)
-        logger.info(f"File saved successfully to: {file_path}")
+        stored_file = await file_storage_service.save_reflection_document(user_id, file)
+        logger.info(f"File saved successfully to: {stored_file.path}")
         
-        # 2. Extract text content
-        text_content = extract_text_from_file(file_path)
-        logger.info(f"Text extraction completed, content length: {len(text_content) if text_content else 0}")
+        # Re-uploads of an identical file reuse the existing reflection
+        existing_reflection = await reflection_repo.get_by_content_hash(user_id, stored_file.sha256)
+        if existing_reflection:
+            return await _reuse_existing_reflection(
+                existing_reflection, stored_file.path, reflection_repo, file_storage_service, background_tasks
+            )
+        
+        # 2. Store a pending stub; content is filled in by the background task
+        now = datetime.utcnow()
+        reflection = ReflectionSource(
+            user_id=user_id,
+            title=file.filename or "Untitled Document",
+            content="",
+            original_filename=file.filename,
+            file_path=stored_file.path,
+            file_size=stored_file.size,
+            content_hash=stored_file.sha256,
+            content_type=content_type,
+            document_type=_DOCUMENT_TYPE_MAPPING[content_type],
+            word_count=0,
+            character_count=0,
+            processing_status=ProcessingStatus.PENDING,
+            created_at=now,
+            updated_at=now
+        )
+        try:
+            created_reflection = await reflection_repo.create(reflection)
+        except DuplicateKeyError:
+            # A concurrent upload of the same file won the insert
+            existing_reflection = await reflection_repo.get_by_content_hash(user_id, stored_file.sha256)
+            if existing_reflection is None:
+                # The winning reflection was deleted before it could be read back
+                file_storage_service.delete_file(stored_file.path)
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="This document is already being uploaded, please try again"
+                )
+            return await _reuse_existing_reflection(
+                existing_reflection, stored_file.path, reflection_repo, file_storage_service, background_tasks
+            )
+        logger.info(f"Reflection created successfully with ID: {created_reflection.id}")
         
-        # 3. Calculate word count
-        word_count = len(text_content.split()) if text_content else 0
-        character_count = len(text_content) if text_content else 0
+        # 3. Queue extraction and AI analysis
+        background_tasks.add_task(_process_uploaded_reflection, str(created_reflection.id))
         
-        # 4. Determine document type based on content type
-        document_type = DocumentType.PDF
-        if file.content_type:
-            if "pdf" in file.content_type.lower():
-                document_type = DocumentType.PDF
-            elif "word" in file.content_type.lower() or "docx" in file.content_type.lower():
-                document_type = DocumentType.DOCX
-            else:
-                document_type = DocumentType.TEXT
+        return created_reflection
         
-        # 5. Perform AI analysis on the extracted text
-        ai_analysis_result = None
-        processing_status = ProcessingStatus.PROCESSING
-        ai_processing_completed_at = None
-        generated_title = file.filename or "Untitled Document"
+    except HTTPException:
+        # Re-raise HTTP exceptions from file storage service
+        raise
+    except Exception as e:
+        logger.error(f"Upload failed for user {user_id}, file {file.filename}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process document upload: {str(e)}"
+        )
+
+async def _reuse_existing_reflection(
+    reflection: ReflectionSource,
+    duplicate_path: str,
+    reflection_repo: ReflectionSourceRepository,
+    file_storage_service: FileStorageService,
+    background_tasks: BackgroundTasks
+) -> ReflectionSource:
+    """
+    Return an existing reflection for a duplicate upload instead of reprocessing it.
+    
+    The newly written copy is deleted. Reflections whose processing failed
+    are queued again so a re-upload still acts as a retry.
+    
+    Args:
+        reflection: Existing reflection created from the same file
+        duplicate_path: Path of the just-written duplicate upload
+        reflection_repo: Repository used to requeue failed reflections
+        file_storage_service: Storage service that wrote the duplicate
+        background_tasks: Background tasks of the current request
+        
+    Returns:
+        ReflectionSource: The existing reflection
+    """
+    file_storage_service.delete_file(duplicate_path)
+    logger.info(f"Duplicate upload matched existing reflection: {reflection.id}")
+    
+    # Concurrent re-uploads race for the claim; only the winner queues a run
+    if (
+        reflection.processing_status == ProcessingStatus.FAILED
+        and await reflection_repo.claim_failed_for_retry(str(reflection.id))
+    ):
+        reflection.processing_status = ProcessingStatus.PENDING
+        reflection.processing_errors = None
+        background_tasks.add_task(_process_uploaded_reflection, str(reflection.id))
+    
+    return reflection
+
+async def _process_uploaded_reflection(reflection_id: str) -> None:
+    """
+    Extract text, run AI analysis and create insights for an uploaded reflection.
+    
+    Runs as a background task after the upload response has been sent. The
+    record is reloaded so the task only depends on what was persisted.
+    
+    Args:
+        reflection_id: ID of the pending reflection source
+    """
+    reflection_repo = ReflectionSourceRepository()
+    file_storage_service = FileStorageService()
+    
+    reflection = await reflection_repo.get_by_id(reflection_id)
+    if not reflection:
+        logger.error(f"❌ Reflection {reflection_id} not found for processing")
+        return
+    
+    file_path = reflection.file_path
+    user_id = reflection.user_id
+    
+    pending_tasks = []
+    
+    try:
+        # The status write only has to land before the final update
+        status_task = asyncio.create_task(
+            reflection_repo.update(reflection_id, {"processing_status": ProcessingStatus.PROCESSING})
+        )
+        pending_tasks.append(status_task)
         
+        # 1. Extract text content off the event loop
+        text_content, word_count, character_count = await run_in_threadpool(extract_text_with_counts, file_path)
+        text_extraction_completed_at = datetime.utcnow()
+        logger.info(f"Text extraction completed, content length: {len(text_content) if text_content else 0}")
+        
+        # 2. Start AI analysis so the LLM round trip overlaps the storage writes
+        ai_task = None
         if text_content and text_content.strip():
             logger.info("Starting AI analysis of extracted text")
-            ai_analysis_result = await analyze_text_for_insights(text_content)
-            processing_status = ProcessingStatus.COMPLETED
-            ai_processing_completed_at = datetime.utcnow()
+            ai_task = asyncio.create_task(analyze_text_for_insights(text_content))
+            pending_tasks.append(ai_task)
+        else:
+            logger.warning("No text content available for AI analysis")
+        
+        # Keep the full text out of the Mongo document; only an excerpt is inline
+        content_uri = await run_in_threadpool(
+            file_storage_service.save_extracted_text, file_path, text_content or ""
+        )
+        
+        update_data = {
+            "content_uri": content_uri,
+            "content_excerpt": (text_content or "")[:CONTENT_EXCERPT_LENGTH],
+            "word_count": word_count,
+            "character_count": character_count,
+            "text_extraction_completed_at": text_extraction_completed_at,
+        }
+        
+        await status_task
+        
+        ai_analysis_result = None
+        if ai_task:
+            ai_analysis_result = await ai_task
+            update_data["ai_processing_completed_at"] = datetime.utcnow()
             
-            # Extract the generated title from AI analysis
+            # Use the AI generated title in place of the filename
             if ai_analysis_result and ai_analysis_result.get("title"):
-                generated_title = ai_analysis_result["title"]
-                logger.info(f"✅ AI generated title: {generated_title}")
+                update_data["title"] = ai_analysis_result["title"]
+                reflection.title = update_data["title"]
+                logger.info(f"✅ AI generated title: {update_data['title']}")
             
             logger.info("✅ AI analysis completed successfully")
-        else:
-            logger.warning("No text content available for AI analysis")
-            processing_status = ProcessingStatus.COMPLETED
         
-        # 6. Create DocumentAnalysis object from AI result
-        document_analysis = None
+        # 3. Create DocumentAnalysis object from AI result
         if ai_analysis_result:
-            from app.models.journey.reflection import DocumentAnalysis
             document_analysis = DocumentAnalysis(
                 summary=ai_analysis_result.get("summary", ""),
                 key_themes=ai_analysis_result.get("key_themes", []),
                 sentiment=ai_analysis_result.get("sentiment", "neutral"),
                 sentiment_score=ai_analysis_result.get("sentiment_score", 0.0),
                 entities=ai_analysis_result.get("entities", {}),
-                categorized_insights=ai_analysis_result.get("categorized_insights") # Add this line
+                categorized_insights=ai_analysis_result.get("categorized_insights")
             )
+            update_data["document_analysis"] = document_analysis.model_dump()
         
-        # 7. Create ReflectionSource record with complete data including AI analysis
-        reflection = ReflectionSource(
-            user_id=user_id,
-            title=generated_title,  # Use AI-generated title instead of filename
-            content=text_content,
-            original_filename=file.filename,
-            file_path=file_path,
-            file_size=file.size,
-            content_type=file.content_type,
-            document_type=document_type,
-            document_analysis=document_analysis,  # Include AI analysis results
-            word_count=word_count,
-            character_count=character_count,
-            processing_status=processing_status,
-            text_extraction_completed_at=datetime.utcnow(),
-            ai_processing_completed_at=ai_processing_completed_at,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        
-        # 8. Save to database
-        created_reflection = await reflection_repo.create(reflection)
-        logger.info(f"Reflection created successfully with ID: {created_reflection.id}")
-        
-        # 9. Create individual Insight records from categorized insights
+        # 4. Create the individual Insight records first, then mark the
+        #    reflection COMPLETED together with the insight links. Running
+        #    these in order means a failed insert never leaves a COMPLETED
+        #    reflection behind, and a failed status write is cleaned up below.
+        insight_ids = []
         if ai_analysis_result and ai_analysis_result.get("categorized_insights"):
-            await _create_insights_from_analysis(
-                created_reflection,
+            insight_ids = await _create_insights_from_analysis(
+                reflection,
                 ai_analysis_result["categorized_insights"],
                 user_id
             )
-            logger.info("✅ Individual insights created successfully")
-        
-        return created_reflection
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions from file storage service
-        raise
+        update_data["insight_ids"] = insight_ids
+        update_data["processing_status"] = ProcessingStatus.COMPLETED
+        if await reflection_repo.update(reflection_id, update_data) is None:
+            raise RuntimeError("failed to mark reflection as completed")
+        logger.info(f"✅ Reflection {reflection_id} processed successfully")
+    
     except Exception as e:
-        logger.error(f"Upload failed for user {user_id}, file {file.filename}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process document upload: {str(e)}"
-        )
+        logger.error(f"❌ Processing failed for reflection {reflection_id}: {e}")
+        for task in pending_tasks:
+            task.cancel()
+        try:
+            # Drop any insights from this run so a retry starts from a clean slate
+            await InsightRepository().delete_by_source_id(user_id, reflection_id)
+        except Exception as cleanup_error:
+            logger.error(f"❌ Failed to remove insights for reflection {reflection_id}: {cleanup_error}")
+        await reflection_repo.update(reflection_id, {
+            "processing_status": ProcessingStatus.FAILED,
+            "processing_errors": str(e),
+            "insight_ids": []
+        })
 
 @router.get("/insights", response_model=dict)
 async def get_insights(
     user_info: dict = Depends(get_current_user_clerk_id),
-    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository)
+    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    include_content: bool = Query(False, description="Also return each reflection's full text")
 ):
     """
     Get real insights data from the database for the user's journey feed.
     
-    This endpoint returns actual ReflectionSource documents from the database
-    with proper categorized insights mapping for the frontend.
+    This endpoint returns one page of actual ReflectionSource documents from
+    the database with proper categorized insights mapping for the frontend;
+    data.pagination carries the totals. Items carry a `preview`, and
+    `content` is null unless include_content is set. The serialized response
+    is cached in Redis until the user's reflections change.
     """
     user_id = user_info['clerk_user_id']
     logger.info(f"Getting insights for user: {user_id}")
     
-    # Fetch all ReflectionSource documents for the user from the database
-    reflections = await reflection_repo.get_by_user_id(user_id)
+    version = await get_cache_version(JOURNEY_CACHE_NAMESPACE, user_id)
+    cache_key = (
+        f"{JOURNEY_CACHE_NAMESPACE}:insights:{user_id}:{version}:{skip}:{limit}:{int(include_content)}"
+    )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Fetch the projected page and the total count concurrently
+    reflections, total_count = await asyncio.gather(
+        reflection_repo.get_insights_projected(
+            user_id, skip=skip, limit=limit, include_content=include_content
+        ),
+        reflection_repo.count_for_user(user_id)
+    )
+    if include_content:
+        await reflection_repo.with_full_content(reflections)
     
-    # Convert ReflectionSource objects to the format expected by frontend
+    # Convert projected documents to the format expected by frontend
     insights = []
     for reflection in reflections:
-        # Extract categorized insights from document_analysis.entities
         insights_by_category = {}
-        categorized_insights = None
-        
-        if (reflection.document_analysis and
-            hasattr(reflection.document_analysis, 'categorized_insights') and
-            reflection.document_analysis.categorized_insights):
-            categorized_insights = reflection.document_analysis.categorized_insights
+        categorized_insights = reflection.get("categorized_insights")
         
         # Map categorized insights to frontend format using new emoji system
         if categorized_insights and isinstance(categorized_insights, dict):
-            category_mapping = {
-                "🪞 Understanding Myself": "understanding_myself",
-                "👥 Navigating Relationships": "navigating_relationships",
-                "💪 Optimizing Performance": "optimizing_performance",
-                "🎯 Making Progress": "making_progress"
-            }
-            
-            for ai_category, frontend_key in category_mapping.items():
-                if ai_category in categorized_insights:
-                    insights_list = categorized_insights[ai_category]
-                    if insights_list and isinstance(insights_list, list):
-                        insights_by_category[frontend_key] = [
-                            item.get('insight', '') if isinstance(item, dict) else str(item)
-                            for item in insights_list if item
-                        ]
-            
+            for ai_category, frontend_key in _CATEGORY_FRONTEND_KEYS:
+                insights_list = categorized_insights.get(ai_category)
+                if insights_list and isinstance(insights_list, list):
+                    insights_by_category[frontend_key] = [
+                        item.get('insight', '') if isinstance(item, dict) else str(item)
+                        for item in insights_list if item
+                    ]
+        
+        preview = reflection.get("preview") or ""
+        
         insight_data = {
-            "id": str(reflection.id),
-            "title": reflection.title,  # Use AI-generated title directly
-            "summary": reflection.content[:150] + "..." if reflection.content and len(reflection.content) > 150 else reflection.content or "",
-            "content": reflection.content,
-            "categories": reflection.categories if reflection.categories else ["general"],
-            "tags": reflection.tags if reflection.tags else [],
-            "key_points": [reflection.content[:200]] if reflection.content else [],
+            "id": str(reflection["_id"]),
+            "title": reflection.get("title"),  # Use AI-generated title directly
+            "summary": preview[:150] + "..." if len(preview) > 150 else preview,
+            "content": (reflection.get("content") or "") if include_content else None,
+            "preview": preview,
+            "categories": reflection.get("categories") or ["general"],
+            "tags": reflection.get("tags") or [],
+            "key_points": [preview[:200]] if preview else [],
             "action_items": [],
-            "processing_status": reflection.processing_status.value if reflection.processing_status else "completed",
-            "word_count": reflection.word_count,
-            "document_type": reflection.document_type.value if reflection.document_type else None,
-            "original_filename": reflection.original_filename,
-            "created_at": reflection.created_at.isoformat() if reflection.created_at else "",
-            "updated_at": reflection.updated_at.isoformat() if reflection.updated_at else "",
+            "processing_status": reflection.get("processing_status") or "completed",
+            "word_count": reflection.get("word_count"),
+            "document_type": reflection.get("document_type"),
+            "original_filename": reflection.get("original_filename"),
+            # orjson emits ISO 8601; missing timestamps stay "" as before
+            "created_at": reflection.get("created_at") or "",
+            "updated_at": reflection.get("updated_at") or "",
             "insights_by_category": insights_by_category  # Add categorized insights with new emoji system
         }
         insights.append(insight_data)
@@ -238,63 +432,73 @@ async def get_insights(
     response = {
         "data": {
             "insights": insights,
-            "reflections": insights  # Also provide as reflections for compatibility
+            "reflections": insights,  # Also provide as reflections for compatibility
+            "pagination": {"total_count": total_count, "skip": skip, "limit": limit}
         }
     }
     
     logger.info(f"✅ Successfully retrieved {len(insights)} insights from database")
-    return response
+    payload = orjson.dumps(response)
+    await cache_set(cache_key, payload, INSIGHTS_CACHE_TTL_SECONDS)
+    return Response(content=payload, media_type="application/json")
 
 async def _create_insights_from_analysis(
     reflection: ReflectionSource,
     categorized_insights: dict,
     user_id: str
-) -> None:
+) -> List[str]:
     """
     Create individual Insight records from the AI categorized insights.
     
+    Insights left over from an earlier run for the same reflection are
+    removed first, so reprocessing a reflection never duplicates them.
+    
     Args:
         reflection: The reflection source that generated the insights
         categorized_insights: Dictionary of insights by category
         user_id: User ID for the insights
-    """
-    from app.models.journey.insight import Insight
-    from app.models.journey.enums import CategoryType, ReviewStatus
-    from app.repositories.journey.insight_repository import InsightRepository
     
+    Returns:
+        IDs of the created insights, for the caller to link to the reflection
+    """
     insight_repo = InsightRepository()
+    await insight_repo.delete_by_source_id(user_id, str(reflection.id))
     
-    # Map category names to CategoryType enums
-    category_mapping = {
-        "🪞 Understanding Myself": CategoryType.PERSONAL_GROWTH,
-        "👥 Navigating Relationships": CategoryType.RELATIONSHIPS,
-        "💪 Optimizing Performance": CategoryType.GOALS_ACHIEVEMENT,
-        "🎯 Making Progress": CategoryType.CHALLENGES
-    }
+    # Nothing to insert when every category came back empty
+    if not any(categorized_insights.values()):
+        return []
     
-    created_insights = []
+    # One timestamp for the whole batch keeps generated/created/updated identical
+    now = datetime.utcnow()
+    insights = []
     
     for category_name, insights_list in categorized_insights.items():
         if not insights_list:  # Skip empty categories
             continue
             
-        category_type = category_mapping.get(category_name, CategoryType.PERSONAL_GROWTH)
+        category_type = _CATEGORY_TYPES.get(category_name, CategoryType.PERSONAL_GROWTH)
+        tag_slug = _TAG_SLUGS.get(category_name) or category_name.lower().replace(' ', '_')
         
         for insight_data in insights_list:
+            # Look up each raw field once; these are reused several times below
+            insight_text = insight_data.get('insight')
+            evidence = insight_data.get('evidence') or ''
+            confidence = insight_data.get('confidence', 0.5)
+            
             # Create Insight object with new emoji system categories
             insight = Insight(
                 user_id=user_id,
-                title=f"{category_name}: {insight_data.get('insight', 'Generated Insight')[:50]}...",
-                content=insight_data.get('insight', 'No insight content available'),
-                summary=insight_data.get('evidence', '')[:200] + "..." if len(insight_data.get('evidence', '')) > 200 else insight_data.get('evidence', ''),
+                title=f"{category_name}: {(insight_text or 'Generated Insight')[:50]}...",
+                content=insight_text or 'No insight content available',
+                summary=evidence[:200] + "..." if len(evidence) > 200 else evidence,
                 category=category_type,
                 subcategories=[],
-                tags=[category_name.replace('🪞 ', '').replace('👥 ', '').replace('💪 ', '').replace('🎯 ', '').lower().replace(' ', '_')],
+                tags=[tag_slug],
                 source_id=str(reflection.id),
                 source_title=reflection.title,
-                source_excerpt=insight_data.get('evidence', '')[:300],
+                source_excerpt=evidence[:300],
                 review_status=ReviewStatus.DRAFT,
-                confidence_score=float(insight_data.get('confidence', 0.5)),
+                confidence_score=float(confidence),
                 is_favorite=False,
                 is_archived=False,
                 user_rating=None,
@@ -304,61 +508,159 @@ async def _create_insights_from_analysis(
                 ai_model_version="enhanced_v1",
                 processing_metadata={
                     "category": category_name,
-                    "original_evidence": insight_data.get('evidence', ''),
-                    "confidence": insight_data.get('confidence', 0.5)
+                    "original_evidence": evidence,
+                    "confidence": confidence
                 },
-                generated_at=datetime.utcnow(),
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                generated_at=now,
+                created_at=now,
+                updated_at=now
             )
             
-            # Save insight to database
-            created_insight = await insight_repo.create(insight)
-            created_insights.append(str(created_insight.id))
-            
-            logger.info(f"Created insight: {created_insight.title}")
-    
-    # Update reflection with insight IDs
-    if created_insights:
-        reflection_repo = ReflectionSourceRepository()
-        for insight_id in created_insights:
-            await reflection_repo.add_insight_id(str(reflection.id), insight_id)
-        logger.info(f"Added {len(created_insights)} insight IDs to reflection")
+            insights.append(insight)
+    
+    # Save all insights in a single round trip
+    created_insights = await insight_repo.create_many(insights)
+    logger.info(f"Created {len(created_insights)} insights")
+    return [str(insight.id) for insight in created_insights]
 
 
 @router.get("/journey/feed", response_model=JourneyFeedResponse)
 async def get_journey_feed(
+    request: Request,
     user_info: dict = Depends(get_current_user_clerk_id),
+    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository),
     skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    include_content: bool = Query(False, description="Also return each reflection's full text")
 ):
     """
     Get the journey feed with real reflections and insights for the user.
+    
+    Items carry a `preview` of the text; `content` is null unless
+    include_content is set, since full texts of uploaded documents are read
+    from storage. GET /reflections/{id} returns a single reflection's text.
+    
+    Clients sending `Accept: application/x-ndjson` receive the page as a
+    stream: one JSON feed item per line as documents leave the cursor, then a
+    final {"meta": {...}} line with the pagination totals.
     """
     user_id = user_info['clerk_user_id']
-    reflection_repo = ReflectionSourceRepository()
-    insight_repo = InsightRepository()
-
-    reflections = await reflection_repo.get_all_for_user(user_id, skip=skip, limit=limit)
     
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream_feed_ndjson(reflection_repo, user_id, skip, limit, include_content),
+            media_type="application/x-ndjson"
+        )
+    
+    version = await get_cache_version(JOURNEY_CACHE_NAMESPACE, user_id)
+    cache_key = (
+        f"{JOURNEY_CACHE_NAMESPACE}:reflection-feed:{user_id}:{version}:{skip}:{limit}:{int(include_content)}"
+    )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Fetch the projected page and the total count concurrently
+    reflections, total_count = await asyncio.gather(
+        reflection_repo.get_feed_page(user_id, skip=skip, limit=limit, include_content=include_content),
+        reflection_repo.count_for_user(user_id)
+    )
+    if include_content:
+        await reflection_repo.with_full_content(reflections)
+    
+    # Projected documents are trusted database output; skip per-field validation
     feed_items = []
     for r in reflections:
-        feed_items.append(JourneyFeedItem(
+        preview = r.get("preview") or ""
+        feed_items.append(JourneyFeedItem.model_construct(
             type="reflection",
-            id=r.id,
-            title=r.title,
-            content=r.content,
-            summary=r.content[:150] + "..." if r.content else "",
-            created_at=r.created_at,
+            id=str(r["_id"]),
+            title=r.get("title"),
+            content=(r.get("content") or "") if include_content else None,
+            preview=preview,
+            summary=preview[:150] + "..." if preview else "",
+            created_at=r.get("created_at"),
+            updated_at=r.get("updated_at"),
             # Add other relevant fields from your JourneyFeedItem schema
         ))
 
     # In the future, you would also fetch and interleave insights.
     
-    return JourneyFeedResponse(
+    feed_response = JourneyFeedResponse(
         items=feed_items,
-        total_count=len(feed_items), # This should be a proper count query in a real app
+        total_count=total_count,
         skip=skip,
         limit=limit,
         category_counts={} # Placeholder
-    )
\ No newline at end of file
+    )
+    payload = feed_response.model_dump_json()
+    await cache_set(cache_key, payload, FEED_CACHE_TTL_SECONDS)
+    return Response(content=payload, media_type="application/json")
+
+
+async def _stream_feed_ndjson(
+    reflection_repo: ReflectionSourceRepository,
+    user_id: str,
+    skip: int,
+    limit: int,
+    include_content: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Yield a feed page as newline-delimited JSON, one reflection per line.
+    
+    Args:
+        reflection_repo: Repository to read the page from
+        user_id: User whose feed is streamed
+        skip: Number of reflections to skip
+        limit: Maximum number of reflections to stream
+        include_content: Also stream each reflection's full text
+    """
+    cursor = reflection_repo.get_feed_page_cursor(
+        user_id, skip=skip, limit=limit, include_content=include_content
+    )
+    async for r in cursor:
+        if include_content:
+            await reflection_repo.with_full_content([r])
+        preview = r.get("preview") or ""
+        yield orjson.dumps({
+            "type": "reflection",
+            "id": str(r["_id"]),
+            "title": r.get("title"),
+            "content": (r.get("content") or "") if include_content else None,
+            "preview": preview,
+            "summary": preview[:150] + "..." if preview else "",
+            "created_at": r.get("created_at"),
+            "updated_at": r.get("updated_at"),
+        }) + b"\n"
+    
+    total_count = await reflection_repo.count_for_user(user_id)
+    yield orjson.dumps({
+        "meta": {"total_count": total_count, "skip": skip, "limit": limit}
+    }) + b"\n"
+
+
+@router.get("/{reflection_id}", response_model=ReflectionSourceResponse)
+async def get_reflection_source(
+    reflection_id: str,
+    user_info: dict = Depends(get_current_user_clerk_id),
+    reflection_repo: ReflectionSourceRepository = Depends(get_reflection_repository)
+):
+    """
+    Get one of the current user's reflection documents with its full text.
+    
+    Declared last so the fixed paths above take precedence over the ID.
+    """
+    reflection = await reflection_repo.get_by_id(reflection_id)
+    if reflection is None or reflection.user_id != user_info['clerk_user_id']:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reflection not found"
+        )
+    
+    try:
+        reflection.content = await reflection_repo.fetch_content(reflection)
+    except OSError as e:
+        # Same fallback as the list views: the excerpt beats failing the request
+        logger.warning(f"Could not read content for reflection {reflection_id}: {e}")
+        reflection.content = reflection.content_excerpt or ""
+    return reflection
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.v1.deps import get_current_user_clerk_id
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from app.core.http_cache import etag_json_response
+from app.api.v1.deps import get_current_user_id, get_invitation_service, require_coach_profile
 from app.services.clerk_invitation_service import ClerkInvitationService
-from app.services.profile_service import ProfileService
-from pydantic import BaseModel
+from app.models.profile import Profile
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class InvitationRequest(BaseModel):
@@ -18,7 +20,12 @@ class InvitationRequest(BaseModel):
     client_organization_name: Optional[str] = ""
 
 
-class InvitationResponse(BaseModel):
+class _ResponseModel(BaseModel):
+    """Immutable base for output-only response models"""
+    model_config = ConfigDict(frozen=True)
+
+
+class InvitationResponse(_ResponseModel):
     clerk_invitation_id: str
     status: str
     client_email: str
@@ -28,7 +35,7 @@ class InvitationResponse(BaseModel):
     coach_organization: str
 
 
-class RelationshipResponse(BaseModel):
+class RelationshipResponse(_ResponseModel):
     client_user_id: str
     client_name: str
     client_email: Optional[str]
@@ -37,7 +44,7 @@ class RelationshipResponse(BaseModel):
     clerk_membership_id: str
 
 
-class PendingInvitationResponse(BaseModel):
+class PendingInvitationResponse(_ResponseModel):
     clerk_invitation_id: str
     client_email: str
     client_name: str
@@ -46,12 +53,12 @@ class PendingInvitationResponse(BaseModel):
     message: Optional[str]
 
 
-class CoachRelationshipsResponse(BaseModel):
+class CoachRelationshipsResponse(_ResponseModel):
     active_relationships: List[RelationshipResponse]
     pending_invitations: List[PendingInvitationResponse]
 
 
-class ClientRelationshipResponse(BaseModel):
+class ClientRelationshipResponse(_ResponseModel):
     coach_organization_id: str
     coach_organization_name: str
     relationship_status: str
@@ -61,199 +68,101 @@ class ClientRelationshipResponse(BaseModel):
     coach_website: Optional[str]
 
 
-class ClientRelationshipsResponse(BaseModel):
+class ClientRelationshipsResponse(_ResponseModel):
     coach_relationships: List[ClientRelationshipResponse]
 
 
 @router.post("/invite", response_model=InvitationResponse)
 async def send_coaching_invitation(
     invitation_data: InvitationRequest,
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    coach_profile: Profile = Depends(require_coach_profile),
+    invitation_service: ClerkInvitationService = Depends(get_invitation_service)
 ):
     """Send a coaching invitation using Clerk's system"""
-    try:
-        invitation_service = ClerkInvitationService()
-        
-        # Verify coach has proper authorization and profile
-        profile_service = ProfileService()
-        coach_profile = await profile_service.get_profile_by_clerk_id(clerk_user_id)
-        
-        if not coach_profile or not coach_profile.coach_data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Coach profile required to send invitations"
-            )
-        
-        if not coach_profile.primary_organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Coach must have an organization to send invitations"
-            )
-        
-        # Send invitation
-        result = await invitation_service.send_coaching_invitation(
-            clerk_user_id, 
-            invitation_data.dict()
-        )
-        
-        return InvitationResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error sending coaching invitation: {str(e)}")
+    if not coach_profile.primary_organization_id:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to send invitation: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Coach must have an organization to send invitations"
         )
+    
+    # Send invitation
+    result = await invitation_service.send_coaching_invitation(
+        coach_profile.clerk_user_id,
+        invitation_data.dict()
+    )
+    
+    return InvitationResponse(**result)
 
 
 @router.get("/coach", response_model=CoachRelationshipsResponse)
 async def get_coach_relationships(
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    request: Request,
+    clerk_user_id: str = Depends(get_current_user_id),
+    invitation_service: ClerkInvitationService = Depends(get_invitation_service)
 ):
     """Get coach's client relationships from Clerk memberships and invitations"""
-    try:
-        invitation_service = ClerkInvitationService()
-        
-        relationships = await invitation_service.get_coach_relationships(clerk_user_id)
-        
-        # Format active relationships
-        active_relationships = [
-            RelationshipResponse(
-                client_user_id=rel["client_user_id"],
-                client_name=rel["client_name"],
-                client_email=rel.get("client_email"),
-                relationship_status=rel["relationship_status"],
-                started_at=rel.get("started_at"),
-                clerk_membership_id=rel["clerk_membership_id"]
-            )
-            for rel in relationships["active_relationships"]
-        ]
-        
-        # Format pending invitations
-        pending_invitations = [
-            PendingInvitationResponse(
-                clerk_invitation_id=inv["clerk_invitation_id"],
-                client_email=inv["client_email"],
-                client_name=inv["client_name"],
-                status=inv["status"],
-                expires_at=inv.get("expires_at"),
-                message=inv.get("message")
-            )
-            for inv in relationships["pending_invitations"]
-        ]
-        
-        return CoachRelationshipsResponse(
-            active_relationships=active_relationships,
-            pending_invitations=pending_invitations
-        )
-        
-    except Exception as e:
-        logger.error(f"Error getting coach relationships: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get relationships: {str(e)}"
-        )
+    relationships = await invitation_service.get_coach_relationships(clerk_user_id)
+    
+    # Returning a Response bypasses response_model, so validate against it here
+    response = CoachRelationshipsResponse.model_validate(relationships)
+    return etag_json_response(request, response.model_dump(mode="json"))
 
 
 @router.get("/client", response_model=ClientRelationshipsResponse)
 async def get_client_relationships(
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    request: Request,
+    clerk_user_id: str = Depends(get_current_user_id),
+    invitation_service: ClerkInvitationService = Depends(get_invitation_service)
 ):
     """Get client's coach relationships from Clerk memberships"""
-    try:
-        invitation_service = ClerkInvitationService()
-        
-        relationships = await invitation_service.get_client_relationships(clerk_user_id)
-        
-        # Format coach relationships
-        coach_relationships = [
-            ClientRelationshipResponse(
-                coach_organization_id=rel["coach_organization_id"],
-                coach_organization_name=rel["coach_organization_name"],
-                relationship_status=rel["relationship_status"],
-                joined_at=rel.get("joined_at"),
-                role=rel["role"],
-                coach_specialties=rel.get("coach_specialties", []),
-                coach_website=rel.get("coach_website")
-            )
-            for rel in relationships["coach_relationships"]
-        ]
-        
-        return ClientRelationshipsResponse(
-            coach_relationships=coach_relationships
-        )
-        
-    except Exception as e:
-        logger.error(f"Error getting client relationships: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get relationships: {str(e)}"
-        )
+    relationships = await invitation_service.get_client_relationships(clerk_user_id)
+    
+    # Returning a Response bypasses response_model, so validate against it here
+    response = ClientRelationshipsResponse.model_validate(relationships)
+    return etag_json_response(request, response.model_dump(mode="json"))
 
 
 @router.get("/invitations/{invitation_id}")
-async def get_invitation_details(invitation_id: str):
+async def get_invitation_details(
+    invitation_id: str,
+    invitation_service: ClerkInvitationService = Depends(get_invitation_service)
+):
     """Get invitation details by ID (public endpoint for invitation acceptance)"""
-    try:
-        invitation_service = ClerkInvitationService()
-        
-        invitation = await invitation_service.get_invitation_details(invitation_id)
-        
-        if not invitation:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Invitation not found or expired"
-            )
-        
-        return {
-            "invitation_id": invitation["invitation_id"],
-            "status": invitation["status"],
-            "email_address": invitation["email_address"],
-            "expires_at": invitation.get("expires_at"),
-            "coach_name": invitation.get("coach_name"),
-            "message": invitation.get("message"),
-            "client_organization_name": invitation.get("client_organization_name"),
-            "invitation_type": invitation.get("invitation_type")
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting invitation details: {str(e)}")
+    invitation = await invitation_service.get_invitation_details(invitation_id)
+    
+    if not invitation:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get invitation details: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invitation not found or expired"
         )
+    
+    return {
+        "invitation_id": invitation["invitation_id"],
+        "status": invitation["status"],
+        "email_address": invitation["email_address"],
+        "expires_at": invitation.get("expires_at"),
+        "coach_name": invitation.get("coach_name"),
+        "message": invitation.get("message"),
+        "client_organization_name": invitation.get("client_organization_name"),
+        "invitation_type": invitation.get("invitation_type")
+    }
 
 
 @router.delete("/invitations/{invitation_id}")
 async def revoke_invitation(
     invitation_id: str,
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    clerk_user_id: str = Depends(get_current_user_id),
+    invitation_service: ClerkInvitationService = Depends(get_invitation_service)
 ):
     """Revoke/cancel a pending invitation"""
-    try:
-        invitation_service = ClerkInvitationService()
-        
-        # TODO: Add authorization check to ensure user can revoke this invitation
-        
-        success = await invitation_service.revoke_invitation(invitation_id)
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to revoke invitation"
-            )
-        
-        return {"message": "Invitation revoked successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error revoking invitation: {str(e)}")
+    # TODO: Add authorization check to ensure user can revoke this invitation
+    
+    success = await invitation_service.revoke_invitation(invitation_id)
+    
+    if not success:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to revoke invitation: {str(e)}"
-        )
\ No newline at end of file
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to revoke invitation"
+        )
+    
+    return {"message": "Invitation revoked successfully"}
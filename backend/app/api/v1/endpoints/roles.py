@@ -1,17 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.v1.deps import get_current_user_clerk_id
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from app.api.v1.deps import get_current_user_clerk_id, get_user_service
 from app.services.user_service import UserService
+from app.core.http_cache import etag_json_response
 from typing import Dict, Any, List
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/me/roles")
 async def get_current_user_roles(
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    request: Request,
+    user_info: dict = Depends(get_current_user_clerk_id),
+    user_service: UserService = Depends(get_user_service)
 ) -> Dict[str, Any]:
     """
     Get current user's organization roles and permissions.
@@ -21,10 +25,10 @@ async def get_current_user_roles(
     - Organization roles with permissions
     - All available permissions
     """
+    clerk_user_id = user_info["clerk_user_id"]
     try:
         logger.info(f"Getting roles for user: {clerk_user_id}")
         
-        user_service = UserService()
         roles_data = await user_service.get_user_roles(clerk_user_id)
         
         if not roles_data:
@@ -49,7 +53,7 @@ async def get_current_user_roles(
         logger.info(f"Primary role: {response['primaryRole']}")
         logger.info(f"Organization roles count: {len(response['organizationRoles'])}")
         
-        return response
+        return etag_json_response(request, response)
         
     except HTTPException:
         raise
@@ -63,17 +67,19 @@ async def get_current_user_roles(
 
 @router.get("/me/permissions")
 async def get_current_user_permissions(
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    request: Request,
+    user_info: dict = Depends(get_current_user_clerk_id),
+    user_service: UserService = Depends(get_user_service)
 ) -> Dict[str, Any]:
     """
     Get current user's permissions only.
     
     Returns just the permissions array for quick permission checks.
     """
+    clerk_user_id = user_info["clerk_user_id"]
     try:
         logger.info(f"Getting permissions for user: {clerk_user_id}")
         
-        user_service = UserService()
         roles_data = await user_service.get_user_roles(clerk_user_id)
         
         if not roles_data:
@@ -82,10 +88,10 @@ async def get_current_user_permissions(
                 detail="User not found"
             )
         
-        return {
+        return etag_json_response(request, {
             "permissions": roles_data.get("permissions", []),
             "primaryRole": roles_data["primary_role"]
-        }
+        })
         
     except HTTPException:
         raise
@@ -99,17 +105,19 @@ async def get_current_user_permissions(
 
 @router.get("/me/organizations")
 async def get_current_user_organizations(
-    clerk_user_id: str = Depends(get_current_user_clerk_id)
+    request: Request,
+    user_info: dict = Depends(get_current_user_clerk_id),
+    user_service: UserService = Depends(get_user_service)
 ) -> Dict[str, Any]:
     """
     Get current user's organization memberships.
     
     Returns organization memberships and roles.
     """
+    clerk_user_id = user_info["clerk_user_id"]
     try:
         logger.info(f"Getting organizations for user: {clerk_user_id}")
         
-        user_service = UserService()
         roles_data = await user_service.get_user_roles(clerk_user_id)
         
         if not roles_data:
@@ -118,10 +126,10 @@ async def get_current_user_organizations(
                 detail="User not found"
             )
         
-        return {
+        return etag_json_response(request, {
             "organizationMemberships": roles_data.get("organization_memberships", []),
             "organizationRoles": roles_data.get("organization_roles", [])
-        }
+        })
         
     except HTTPException:
         raise
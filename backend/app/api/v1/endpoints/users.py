@@ -1,28 +1,81 @@
+import asyncio
+import logging
 from datetime import datetime
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response, status)
+from fastapi.responses import ORJSONResponse
+from pymongo.errors import DuplicateKeyError
 
-from app.api.v1.deps import org_optional
+from app.api.v1.deps import get_profile_service, get_user_service, org_optional
 from app.core.config import settings
-from app.models.profile import ClientData, CoachData
-from app.schemas.profile import (ProfileCreateRequest, ProfileResponse,
+from app.core.http_cache import etag_body_response
+from app.db.redis import cache_get, cache_set
+from app.models.profile import ClientData, CoachData, Profile
+from app.repositories.profile_repository import profile_cache_key
+from app.schemas.profile import (ClientDataSchema, CoachDataSchema,
+                                 ProfileCreateRequest, ProfileResponse,
                                  ProfileUpdateRequest)
-from app.services.profile_service import ProfileService
-from app.services.user_service import UserService
+from app.services.profile_service import ProfileService, coach_lookup_miss_key
+from app.services.user_service import UserService, user_cache_key, get_primary_email
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Clerk user data is invalidated by the user.updated webhook; profile keys are
+# versioned and ProfileRepository bumps the version on every write
+USER_CACHE_TTL_SECONDS = 60
+PROFILE_CACHE_TTL_SECONDS = 300
+# How long clients may reuse the Clerk user listing before refetching
+ALL_USERS_CACHE_MAX_AGE_SECONDS = 60
+# Negative cache for coach emails that failed verification at client signup;
+# cleared as soon as the coach sets up their profile
+COACH_LOOKUP_MISS_TTL_SECONDS = 300
+# Cached miss reasons
+_COACH_MISSING = b"missing"
+_COACH_INCOMPLETE = b"incomplete"
+
+
+def _profile_response_json(profile: Profile) -> bytes:
+    """
+    Serialize a stored profile as a ProfileResponse body.
+    
+    The profile was already validated when it was loaded, so the response
+    is assembled with model_construct instead of being validated again.
+    """
+    response = ProfileResponse.model_construct(
+        id=str(profile.id),
+        user_id=profile.clerk_user_id,
+        clerk_user_id=profile.clerk_user_id,
+        first_name=profile.first_name,
+        last_name=profile.last_name,
+        coach_data=CoachDataSchema.model_construct(**profile.coach_data.model_dump()) if profile.coach_data else None,
+        client_data=ClientDataSchema.model_construct(**profile.client_data.model_dump()) if profile.client_data else None,
+        primary_organization_id=profile.primary_organization_id,
+        created_at=profile.created_at.isoformat(),
+        updated_at=profile.updated_at.isoformat()
+    )
+    return response.model_dump_json().encode()
 
 
 @router.get("/me")
 async def get_current_user(
-    user_info: dict = Depends(org_optional)
+    request: Request,
+    user_info: dict = Depends(org_optional),
+    user_service: UserService = Depends(get_user_service)
 ):
     """Get current user's basic information from Clerk"""
     
     clerk_user_id = user_info['clerk_user_id']
-    user_service = UserService()
-    user = user_service.get_user(clerk_user_id)
+    cache_key = user_cache_key(clerk_user_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return etag_body_response(request, cached)
+    
+    user = await asyncio.to_thread(user_service.get_user, clerk_user_id)
     
     if not user:
         raise HTTPException(
@@ -30,15 +83,7 @@ async def get_current_user(
             detail="User not found in Clerk"
         )
     
-    def get_primary_email(user):
-        if not user or not user.email_addresses:
-            return None
-        for email in user.email_addresses:
-            if email.id == user.primary_email_address_id:
-                return email.email_address
-        return user.email_addresses[0].email_address
-
-    return {
+    user_data = {
         "clerk_user_id": user.id,
         "email": get_primary_email(user),
         "primary_role": user.public_metadata.get("primary_role", "member"),
@@ -46,17 +91,27 @@ async def get_current_user(
         "first_name": user.first_name,
         "last_name": user.last_name,
         "image_url": user.image_url,
-        "created_at": datetime.fromtimestamp(user.created_at / 1000).isoformat()
+        # orjson writes datetimes as ISO 8601 itself
+        "created_at": datetime.fromtimestamp(user.created_at / 1000)
     }
+    payload = orjson.dumps(user_data)
+    await cache_set(cache_key, payload, USER_CACHE_TTL_SECONDS)
+    return etag_body_response(request, payload)
 
 
 @router.get("/me/profile", response_model=ProfileResponse)
 async def get_user_profile(
-    user_info: dict = Depends(org_optional)
+    request: Request,
+    user_info: dict = Depends(org_optional),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Get current user's profile. If not found, a new one is created."""
     clerk_user_id = user_info['clerk_user_id']
-    profile_service = ProfileService()
+    # Fetched before the MongoDB read; see profile_cache_key
+    cache_key = await profile_cache_key(clerk_user_id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return etag_body_response(request, cached)
     
     profile = await profile_service.get_profile_by_clerk_id(clerk_user_id)
     
@@ -67,129 +122,99 @@ async def get_user_profile(
         profile_data = {
             "first_name": user_info.get("first_name", ""),
             "last_name": user_info.get("last_name", ""),
-            "coach_data": CoachData().dict() if primary_role == "coach" else None,
-            "client_data": ClientData().dict() if primary_role == "client" else None,
+            "coach_data": CoachData().model_dump() if primary_role == "coach" else None,
+            "client_data": ClientData().model_dump() if primary_role == "client" else None,
         }
         
-        profile = await profile_service.create_profile(clerk_user_id, profile_data)
+        try:
+            profile = await profile_service.create_profile(
+                clerk_user_id, profile_data, email=user_info.get("email")
+            )
+        except DuplicateKeyError:
+            # A concurrent request created it first
+            profile = await profile_service.get_profile_by_clerk_id(clerk_user_id)
 
-    return ProfileResponse(
-        id=str(profile.id),
-        user_id=profile.clerk_user_id,
-        clerk_user_id=profile.clerk_user_id,
-        first_name=profile.first_name,
-        last_name=profile.last_name,
-        coach_data=profile.coach_data.dict() if profile.coach_data else None,
-        client_data=profile.client_data.dict() if profile.client_data else None,
-        primary_organization_id=getattr(profile, 'primary_organization_id', None),
-        created_at=profile.created_at.isoformat(),
-        updated_at=profile.updated_at.isoformat()
-    )
+    payload = _profile_response_json(profile)
+    await cache_set(cache_key, payload, PROFILE_CACHE_TTL_SECONDS)
+    return etag_body_response(request, payload)
 
 
 @router.put("/me/profile", response_model=ProfileResponse)
 async def update_user_profile(
     profile_data: ProfileUpdateRequest,
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Update current user's profile"""
     clerk_user_id = user_info['clerk_user_id']
-    profile_service = ProfileService()
     
     # Convert to dict, excluding None values
-    update_data = profile_data.dict(exclude_unset=True)
+    update_data = profile_data.model_dump(exclude_unset=True)
     
-    updated_profile = await profile_service.update_profile(clerk_user_id, update_data)
+    updated_profile = await profile_service.update_profile(
+        clerk_user_id, update_data, email=user_info.get("email")
+    )
     if not updated_profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
     
-    return ProfileResponse(
-        id=str(updated_profile.id),
-        user_id=updated_profile.user_id,
-        first_name=updated_profile.first_name,
-        last_name=updated_profile.last_name,
-        coach_data=updated_profile.coach_data,
-        client_data=updated_profile.client_data,
-        created_at=updated_profile.created_at.isoformat(),
-        updated_at=updated_profile.updated_at.isoformat()
-    )
+    return Response(content=_profile_response_json(updated_profile), media_type="application/json")
 
 
 @router.post("/me/profile", response_model=ProfileResponse)
 async def create_user_profile(
     profile_data: ProfileCreateRequest,
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Create current user's profile"""
     clerk_user_id = user_info['clerk_user_id']
-    profile_service = ProfileService()
     
-    # Check if profile already exists
-    existing_profile = await profile_service.get_profile_by_clerk_id(clerk_user_id)
-    if existing_profile:
+    # Convert to dict
+    create_data = profile_data.model_dump()
+    
+    # The unique clerk_user_id index rejects a second profile
+    try:
+        created_profile = await profile_service.create_profile(
+            clerk_user_id, create_data, email=user_info.get("email")
+        )
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Profile already exists"
         )
     
-    # Convert to dict
-    create_data = profile_data.dict()
-    
-    created_profile = await profile_service.create_profile(clerk_user_id, create_data)
-    
-    return ProfileResponse(
-        id=str(created_profile.id),
-        user_id=created_profile.user_id,
-        first_name=created_profile.first_name,
-        last_name=created_profile.last_name,
-        coach_data=created_profile.coach_data,
-        client_data=created_profile.client_data,
-        created_at=created_profile.created_at.isoformat(),
-        updated_at=created_profile.updated_at.isoformat()
-    )
+    return Response(content=_profile_response_json(created_profile), media_type="application/json")
 
 
 @router.get("/access/check-coach-authorization")
 async def check_coach_authorization(
-    user_info: dict = Depends(org_optional)
+    user_info: dict = Depends(org_optional),
+    user_service: UserService = Depends(get_user_service)
 ):
     """Check if current user is authorized to be a coach"""
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     clerk_user_id = user_info['clerk_user_id']
-    user_service = UserService()
-    user = user_service.get_user(clerk_user_id)
+    user = await asyncio.to_thread(user_service.get_user, clerk_user_id)
     
-    logger.info(f"Checking authorization for clerk_user_id: {clerk_user_id}")
-    logger.info(f"User found: {user is not None}")
-
-    def get_primary_email(user):
-        if not user or not user.email_addresses:
-            return None
-        for email in user.email_addresses:
-            if email.id == user.primary_email_address_id:
-                return email.email_address
-        return user.email_addresses[0].email_address
+    logger.debug("Checking authorization for clerk_user_id: %s (user found: %s)", clerk_user_id, user is not None)
 
     user_email = get_primary_email(user)
 
-    if user:
-        logger.info(f"User email: {user_email}")
-        logger.info(f"Whitelist emails: {settings.coach_whitelist_emails_list}")
-        logger.info(f"Email in whitelist: {user_email.lower() in settings.coach_whitelist_emails_list}")
-    
     if not user or not user_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"User email not found for clerk_user_id: {clerk_user_id}"
         )
     
-    is_authorized = user_email.lower() in settings.coach_whitelist_emails_list
+    is_authorized = user_email.lower() in settings.coach_whitelist_set
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "User email: %s, whitelist: %s, authorized: %s",
+            user_email, sorted(settings.coach_whitelist_set), is_authorized
+        )
     
     return {
         "authorized": is_authorized,
@@ -198,24 +223,36 @@ async def check_coach_authorization(
     }
 
 @router.get("/all")
-async def get_all_users():
-    """Get all users from Clerk"""
+async def get_all_users(
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Get a page of users from Clerk, with the total in X-Total-Count"""
     
-    user_service = UserService()
-    users = user_service.get_all_users()
+    users, total = await asyncio.gather(
+        asyncio.to_thread(user_service.get_all_users, limit, offset),
+        asyncio.to_thread(user_service.count_users),
+    )
     
-    if not users:
+    if users is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No users found in Clerk"
         )
     
+    response.headers["Cache-Control"] = f"private, max-age={ALL_USERS_CACHE_MAX_AGE_SECONDS}"
+    # Lets clients page through all users; omitted if Clerk could not count them
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     return users
 
 
 @router.post("/access/verify-coach-for-client")
 async def verify_coach_for_client(
-    request: Dict[str, Any]
+    request: Dict[str, Any],
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     """Verify that a coach exists and is authorized (for client signup)"""
     
@@ -227,28 +264,36 @@ async def verify_coach_for_client(
             detail="coach_email is required"
         )
     
+    # Normalized for the whitelist and the cache key; the response echoes the input
+    normalized_email = coach_email.strip().lower()
+    
     # Check if coach email is in whitelist
-    if coach_email.lower() not in settings.coach_whitelist_emails_list:
+    if normalized_email not in settings.coach_whitelist_set:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Coach not found or not authorized"
         )
     
-    # Check if coach actually exists in our system
-    user_service = UserService()
-    coach_user = user_service.get_user_by_email(coach_email)
+    miss_key = coach_lookup_miss_key(normalized_email)
+    miss = await cache_get(miss_key)
     
-    if not coach_user:
+    if miss is None:
+        # Check if coach actually exists in our system and has a profile
+        coach_user, coach_profile = await profile_service.get_coach_by_email(normalized_email)
+        if not coach_user:
+            miss = _COACH_MISSING
+        elif not coach_profile or not coach_profile.coach_data:
+            miss = _COACH_INCOMPLETE
+        if miss is not None:
+            await cache_set(miss_key, miss, COACH_LOOKUP_MISS_TTL_SECONDS)
+    
+    if miss == _COACH_MISSING:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Coach not found in system. They may need to complete their registration first."
         )
     
-    # Check if coach has a profile
-    profile_service = ProfileService()
-    coach_profile = await profile_service.get_profile_by_clerk_id(coach_user.id)
-    
-    if not coach_profile or not coach_profile.coach_data:
+    if miss is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Coach has not completed their profile setup"
@@ -1,49 +1,133 @@
-from fastapi import APIRouter, Request, HTTPException, status
-from app.services.user_service import UserService
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from app.services.user_service import UserService, user_cache_key
 from app.services.profile_service import ProfileService
-from app.services.clerk_organization_service import ClerkOrganizationService
+from app.api.v1.deps import get_profile_service, invalidate_user_info_cache
 from app.core.config import settings
 from app.db.mongodb import get_database
-import json
+from app.db.redis import cache_delete
 import logging
+import orjson
 from svix.webhooks import Webhook
 from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# The only request headers Svix needs to verify a signature
+_SVIX_HEADERS = ("svix-id", "svix-timestamp", "svix-signature")
 
-def verify_webhook_signature(payload: bytes, headers: dict, secret: str) -> bool:
+
+def _create_webhook_verifier() -> Optional[Webhook]:
+    """Build the Svix verifier once; decoding the secret is not per-request work"""
+    if not settings.clerk_webhook_secret:
+        return None
+    try:
+        return Webhook(settings.clerk_webhook_secret)
+    except Exception as e:
+        # Leave verification failing closed rather than crash the app on import
+        logger.error(f"❌ Invalid Clerk webhook secret: {e}")
+        return None
+
+
+_webhook_verifier = _create_webhook_verifier()
+
+
+def verify_webhook_signature(payload: bytes, headers: dict) -> bool:
     """Verify Clerk webhook signature using official Svix library"""
+    if _webhook_verifier is None:
+        logger.error("Webhook signature verification: no valid secret configured")
+        return False
     try:
-        # Create Svix webhook instance
-        wh = Webhook(secret)
-        
-        # Verify the webhook using Svix
-        wh.verify(payload, headers)
-        logger.info("Webhook signature verification: VALID")
+        _webhook_verifier.verify(payload, headers)
+        logger.debug("Webhook signature verification: VALID")
         return True
     except Exception as e:
         logger.error(f"Webhook signature verification: INVALID - {e}")
         return False
 
 
+async def _handle_session_created(data: dict, profile_service: ProfileService) -> None:
+    user_id = data.get("user_id")
+    if user_id:
+        logger.info("Attempting to sync role for user %s on session creation.", user_id)
+        await profile_service.sync_user_role_from_clerk(user_id)
+    else:
+        logger.warning("No user_id found in session.created event payload.")
+
+
+async def _handle_user_updated(data: dict, profile_service: ProfileService) -> None:
+    user_id = data.get("id")
+    if user_id:
+        logger.info("Attempting to sync role for user %s on user update.", user_id)
+        await profile_service.sync_user_role_from_clerk(user_id)
+    else:
+        logger.warning("No user_id found in user.updated event payload.")
+
+
+async def _handle_organization_created(data: dict) -> None:
+    logger.info("New organization created: %s (ID: %s) by user %s", data.get("name"), data.get("id"), data.get("created_by"))
+    # Additional organization setup logic can be added here if needed
+
+
+async def _handle_organization_updated(data: dict) -> None:
+    logger.info("Organization updated: %s (ID: %s)", data.get("name"), data.get("id"))
+    # Additional organization update logic can be added here if needed
+
+
+async def _handle_organization_deleted(data: dict) -> None:
+    logger.info("Organization deleted: %s (ID: %s)", data.get("name"), data.get("id"))
+    # Additional cleanup logic can be added here if needed
+
+
+# Clerk event type -> handler applying the event. Only the role sync
+# handlers need the profile service, so they are kept in their own table.
+_PROFILE_EVENT_HANDLERS: Dict[str, Callable[[dict, ProfileService], Awaitable[None]]] = {
+    "session.created": _handle_session_created,
+    "user.updated": _handle_user_updated,
+}
+_ORGANIZATION_EVENT_HANDLERS: Dict[str, Callable[[dict], Awaitable[None]]] = {
+    "organization.created": _handle_organization_created,
+    "organization.updated": _handle_organization_updated,
+    "organization.deleted": _handle_organization_deleted,
+}
+
+
+async def _process_clerk_event(event_type: Optional[str], data: dict, profile_service: ProfileService) -> None:
+    """
+    Apply a verified Clerk event before the webhook is acknowledged.
+    
+    Errors propagate so the webhook answers 500 and Svix redelivers the
+    event; the role sync is idempotent, so a retry is safe.
+    """
+    try:
+        if event_type in _PROFILE_EVENT_HANDLERS:
+            await _PROFILE_EVENT_HANDLERS[event_type](data, profile_service)
+        elif event_type in _ORGANIZATION_EVENT_HANDLERS:
+            await _ORGANIZATION_EVENT_HANDLERS[event_type](data)
+        else:
+            logger.debug("Unhandled event type: %s", event_type)
+    except Exception as e:
+        logger.error(f"❌ Error processing Clerk {event_type} event: {e}")
+        raise
+
+
 @router.post("/clerk")
-async def handle_clerk_webhook(request: Request):
+async def handle_clerk_webhook(
+    request: Request,
+    profile_service: ProfileService = Depends(get_profile_service)
+):
     """Handle Clerk user lifecycle webhooks"""
-    logger.info("=== CLERK WEBHOOK RECEIVED ===")
-    
     try:
         # Get the raw body and headers
         body = await request.body()
-        headers = dict(request.headers)
+        headers = {name: request.headers[name] for name in _SVIX_HEADERS if name in request.headers}
         
-        logger.info(f"Request headers: {headers}")
-        logger.info(f"Raw body length: {len(body)} bytes")
+        logger.debug("Webhook svix-id: %s, body length: %d bytes", headers.get("svix-id"), len(body))
         
         # Verify webhook signature if secret is configured
-        if hasattr(settings, 'clerk_webhook_secret') and settings.clerk_webhook_secret:
-            if not verify_webhook_signature(body, headers, settings.clerk_webhook_secret):
+        if settings.clerk_webhook_secret:
+            if not verify_webhook_signature(body, headers):
                 logger.error("Invalid webhook signature")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,20 +138,27 @@ async def handle_clerk_webhook(request: Request):
         
         # Parse the webhook payload
         try:
-            payload = json.loads(body)
-            logger.info(f"Parsed payload keys: {list(payload.keys())}")
-        except json.JSONDecodeError as e:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
             logger.error(f"JSON decode error: {e}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid JSON payload"
             )
+        # orjson accepts any JSON value; Clerk events are always objects
+        if not isinstance(payload, dict) or not isinstance(payload.get("data", {}), dict):
+            logger.error(f"Unexpected webhook payload type: {type(payload).__name__}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload"
+            )
         
         event_type = payload.get("type")
-        data = payload.get("data", {})
+        data = payload.get("data") or {}
         
-        logger.info(f"Event type: {event_type}")
-        logger.info(f"Data keys: {list(data.keys()) if data else 'No data'}")
+        logger.info("Clerk webhook received: %s", event_type)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload keys: %s, data keys: %s", list(payload.keys()), list(data.keys()))
         
         # Test database connection
         try:
@@ -78,7 +169,7 @@ async def handle_clerk_webhook(request: Request):
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Database connection failed"
                 )
-            logger.info("Database connection verified")
+            logger.debug("Database connection verified")
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
             raise HTTPException(
@@ -86,61 +177,23 @@ async def handle_clerk_webhook(request: Request):
                 detail="Database connection failed"
             )
         
-        user_service = UserService()
-        profile_service = ProfileService()
-        clerk_org_service = ClerkOrganizationService()
-        
-        if event_type == "session.created":
-            logger.info("Processing session.created event")
-            user_id = data.get("user_id")
-            if user_id:
-                logger.info(f"Attempting to sync role for user {user_id} on session creation.")
-                await profile_service.sync_user_role_from_clerk(user_id)
-            else:
-                logger.warning("No user_id found in session.created event payload.")
-
-        elif event_type == "organization.created":
-            # Handle new organization creation
-            logger.info("Processing organization.created event")
-            
-            org_id = data.get("id")
-            org_name = data.get("name")
-            created_by = data.get("created_by")
-            
-            logger.info(f"New organization created: {org_name} (ID: {org_id}) by user {created_by}")
-            # Additional organization setup logic can be added here if needed
+        # Role data is cached per user; drop it whenever Clerk reports a change
+        if event_type == "user.updated":
+            UserService.invalidate_user_roles(data.get("id"))
+            invalidate_user_info_cache(data.get("id"))
+            if data.get("id"):
+                await cache_delete(user_cache_key(data["id"]))
+        elif event_type and event_type.startswith("organizationMembership."):
+            member_id = (data.get("public_user_data") or {}).get("user_id")
+            UserService.invalidate_user_roles(member_id)
+            invalidate_user_info_cache(member_id)
+        elif event_type in ("organization.updated", "organization.deleted"):
+            UserService.invalidate_user_roles()
+            invalidate_user_info_cache()
         
-        elif event_type == "organization.updated":
-            # Handle organization updates
-            logger.info("Processing organization.updated event")
-            
-            org_id = data.get("id")
-            org_name = data.get("name")
-            
-            logger.info(f"Organization updated: {org_name} (ID: {org_id})")
-            # Additional organization update logic can be added here if needed
-        
-        elif event_type == "organization.deleted":
-            # Handle organization deletion
-            logger.info("Processing organization.deleted event")
-            
-            org_id = data.get("id")
-            org_name = data.get("name")
-            
-            logger.info(f"Organization deleted: {org_name} (ID: {org_id})")
-            # Additional cleanup logic can be added here if needed
-        
-        elif event_type == "user.updated":
-            logger.info("Processing user.updated event")
-            user_id = data.get("id")
-            if user_id:
-                logger.info(f"Attempting to sync role for user {user_id} on user update.")
-                await profile_service.sync_user_role_from_clerk(user_id)
-            else:
-                logger.warning("No user_id found in user.updated event payload.")
-
-        else:
-            logger.info(f"Unhandled event type: {event_type}")
+        # Processed before acknowledging: a failed role sync must answer
+        # non-2xx so Svix retries it instead of the change being lost
+        await _process_clerk_event(event_type, data, profile_service)
         
         return {"status": "success", "event_type": event_type}
         
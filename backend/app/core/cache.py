@@ -0,0 +1,101 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+import asyncio
+import time
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after a fixed time-to-live.
+
+    Used for per-user data fetched from Clerk that changes on the order of
+    minutes. When full, the entry closest to expiry is evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key for ttl_seconds"""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            # Entries are inserted with the same TTL, so the oldest expires first
+            self._entries.pop(next(iter(self._entries)))
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one shared task.
+
+    Callers arriving while a call for their key is running await its result
+    instead of starting another. forget() detaches a running call, so callers
+    that arrive afterwards (e.g. after a write) start a fresh one and the
+    detached call's on_result hook is skipped.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        on_result: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        """
+        Await fn() for key, sharing a call already in flight.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: Starts the call when none is in flight
+            on_result: Called with the result of a successful call that was
+                not forgotten while running
+
+        Returns:
+            The shared call's result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, on_result))
+        # Shield so a cancelled caller does not cancel the call others share
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]", on_result: Optional[Callable[[Any], None]]) -> None:
+        if self._calls.get(key) is not task:
+            return
+        del self._calls[key]
+        if on_result is not None and not task.cancelled() and task.exception() is None:
+            on_result(task.result())
+
+    def forget(self, key: Hashable) -> None:
+        """Detach the call in flight for key, if any"""
+        self._calls.pop(key, None)
+
+    def clear(self) -> None:
+        """Detach all calls in flight"""
+        self._calls.clear()
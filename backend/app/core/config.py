@@ -1,5 +1,6 @@
+from functools import cached_property
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import FrozenSet, Optional, List
 
 
 class Settings(BaseSettings):
@@ -11,6 +12,9 @@ class Settings(BaseSettings):
     clerk_secret_key: str
     clerk_webhook_secret: str
     
+    # Cache
+    redis_url: Optional[str] = None  # Response caching is disabled when unset
+    
     # External Services
     sendgrid_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
@@ -46,5 +50,10 @@ class Settings(BaseSettings):
             return []
         return [email.strip().lower() for email in self.coach_whitelist_emails.split(",") if email.strip()]
 
+    @cached_property
+    def coach_whitelist_set(self) -> FrozenSet[str]:
+        """Lowercased whitelist emails, parsed once for O(1) membership checks"""
+        return frozenset(self.coach_whitelist_emails_list)
+
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,67 @@
+from types import MappingProxyType
+from typing import Any
+from fastapi import Request, Response
+import hashlib
+import orjson
+
+# Per-user responses: browsers keep a copy but revalidate it on every use
+# (a bodiless 304 while the ETag matches), so role and profile changes show
+# up immediately, and any cache in between keys them by the caller's token
+PRIVATE_CACHE_HEADERS = MappingProxyType({
+    "Cache-Control": "private, no-cache",
+    "Vary": "Authorization",
+})
+
+
+def apply_private_cache_headers(response: Response) -> None:
+    """Mark a per-user response as cacheable only with revalidation"""
+    response.headers.update(PRIVATE_CACHE_HEADERS)
+
+
+def compute_etag(body: bytes) -> str:
+    """Weak ETag for a serialized response body"""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header already names this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """
+    Serialize content with orjson and answer conditional GETs.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        content: JSON-serializable response content
+        
+    Returns:
+        304 Not Modified if the client's copy is current, otherwise the JSON body
+    """
+    return etag_body_response(request, orjson.dumps(content))
+
+
+def etag_body_response(request: Request, body: bytes) -> Response:
+    """
+    Answer conditional GETs for an already serialized JSON body.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        body: Serialized JSON response body
+        
+    Returns:
+        304 Not Modified if the client's copy is current, otherwise the JSON body
+    """
+    etag = compute_etag(body)
+    headers = {"ETag": etag, **PRIVATE_CACHE_HEADERS}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,52 @@
+from typing import Awaitable, Callable, Optional
+from pymongo.errors import ConnectionFailure
+from app.db.mongodb import get_database
+from app.repositories.journey.insight_repository import InsightRepository
+from app.repositories.journey.reflection_repository import ReflectionSourceRepository
+from app.repositories.profile_repository import ProfileRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def _ensure_index(
+    name: str, create: Callable[[], Awaitable[None]], unique_remedy: Optional[str] = None
+) -> None:
+    """
+    Create one group of indexes, isolating its failure from the others.
+
+    Failures never abort startup. Query indexes only speed lookups up, so
+    their failures are logged as errors. Unique indexes are the only guard
+    against duplicate writes, so their failures are logged as critical,
+    together with unique_remedy describing how to fix the data.
+    """
+    try:
+        await create()
+        logger.info(f"✅ MongoDB {name} index ensured")
+    except ConnectionFailure as e:
+        logger.error(f"❌ Database unreachable, {name} index not ensured: {e}")
+    except Exception as e:
+        if unique_remedy is None:
+            logger.error(f"❌ Failed to ensure MongoDB {name} index: {e}")
+        else:
+            logger.critical(
+                f"🚨 Unique MongoDB {name} index NOT built, duplicates will not be rejected: {e}. {unique_remedy}"
+            )
+
+async def ensure_indexes():
+    """Create MongoDB indexes required by repository queries (idempotent)"""
+    if get_database() is None:
+        logger.warning("Skipping index creation - no database connection")
+        return
+
+    reflection_repo = ReflectionSourceRepository()
+    await _ensure_index("insight query", InsightRepository().ensure_indexes)
+    await _ensure_index("reflection query", reflection_repo.ensure_indexes)
+    # Unique indexes are the only guard against duplicate uploads and profiles
+    await _ensure_index(
+        "reflection content hash", reflection_repo.ensure_content_hash_index,
+        unique_remedy="Remove duplicate (user_id, content_hash) reflections and restart."
+    )
+    await _ensure_index(
+        "profile clerk_user_id", ProfileRepository().ensure_indexes,
+        unique_remedy="Run 'python -m migrations.dedupe_profiles migrate' and restart."
+    )
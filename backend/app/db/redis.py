@@ -0,0 +1,106 @@
+from typing import Optional, Union
+import redis.asyncio as aioredis
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RedisCache:
+    client: Optional[aioredis.Redis] = None
+
+cache = RedisCache()
+
+# Namespace for cached journey reads (feed pages, reflection insights);
+# its per-user version is bumped on every reflection/insight write
+JOURNEY_CACHE_NAMESPACE = "journey"
+# Namespaces for per-user look-aside entries deleted explicitly on writes
+USER_CACHE_NAMESPACE = "user"
+PROFILE_CACHE_NAMESPACE = "profile"
+
+async def connect_to_redis():
+    """Create Redis connection used for response caching"""
+    if not settings.redis_url:
+        logger.info("REDIS_URL not configured - response caching disabled")
+        return
+
+    try:
+        cache.client = aioredis.from_url(settings.redis_url)
+        await cache.client.ping()
+        logger.info("✅ Connected to Redis")
+    except Exception as e:
+        logger.error(f"❌ Failed to connect to Redis: {e}")
+        logger.warning("Running without response cache")
+        # Caching is optional - serve everything from MongoDB
+        cache.client = None
+
+async def close_redis_connection():
+    """Close Redis connection"""
+    if cache.client:
+        await cache.client.aclose()
+        cache.client = None
+        logger.info("Disconnected from Redis")
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """Get Redis client, or None when caching is disabled"""
+    return cache.client
+
+def _version_key(namespace: str, user_id: str) -> str:
+    return f"{namespace}:ver:{user_id}"
+
+async def get_cache_version(namespace: str, user_id: str) -> int:
+    """
+    Get the current cache version for a user's entries in a namespace.
+
+    The version is part of every cache key, so bumping it invalidates all
+    cached pages for the user in a single O(1) write.
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+    try:
+        version = await client.get(_version_key(namespace, user_id))
+        return int(version) if version else 0
+    except Exception as e:
+        logger.warning(f"Redis version lookup failed for {namespace}/{user_id}: {e}")
+        return 0
+
+async def bump_cache_version(namespace: str, user_id: str) -> None:
+    """Invalidate all cached entries for a user in a namespace."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.incr(_version_key(namespace, user_id))
+    except Exception as e:
+        logger.warning(f"Redis invalidation failed for {namespace}/{user_id}: {e}")
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Return the cached value for key, or None on a miss or Redis error."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except Exception as e:
+        logger.warning(f"Redis get failed for {key}: {e}")
+        return None
+
+async def cache_set(key: str, value: Union[str, bytes], ttl_seconds: int) -> None:
+    """Store value under key with an expiry; errors are logged and ignored."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, value, ex=ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Redis set failed for {key}: {e}")
+
+async def cache_delete(*keys: str) -> None:
+    """Delete cached keys; errors are logged and ignored."""
+    client = get_redis()
+    if client is None or not keys:
+        return
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Redis delete failed for {keys}: {e}")
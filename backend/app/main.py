@@ -23,6 +23,23 @@ from app.api.v1.endpoints.contact import router as contact_router
 from app.api.v1.webhooks.clerk import router as clerk_router
 from app.api.v1.deps import org_required, org_optional
 from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.redis import connect_to_redis, close_redis_connection
+from app.db.indexes import ensure_indexes
+from app.repositories.journey.reflection_repository import ReflectionSourceRepository
+from app.repositories.journey.insight_repository import InsightRepository
+from app.services.journey.file_storage_service import FileStorageService
+from app.services.user_service import UserService
+from app.services.profile_service import ProfileService
+from app.services.clerk_invitation_service import ClerkInvitationService
+from app.services.entry_service import EntryService
+from app.services.freemium_service import FreemiumService
+from app.services.text_extraction_service import TextExtractionService
+from app.services.text_extraction_service import shutdown_pdf_executor
+from app.middleware.errors import UnhandledErrorMiddleware
+from app.middleware.request_cache import RequestProfileCacheMiddleware
+from app.middleware.upload_limit import UploadSizeLimitMiddleware
+from app.api.v1.endpoints.entries import MAX_ENTRY_FILE_SIZE
+from app.services.journey.file_storage_service import MAX_REFLECTION_FILE_SIZE
 import logging
 from dotenv import load_dotenv
 
@@ -35,26 +52,58 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Arete MVP API", version="1.0.0")
 
-# Add CORS middleware
+# Deduplicate profile lookups within a single request
+app.add_middleware(RequestProfileCacheMiddleware)
+
+# Reject oversized uploads before their bodies are read
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/v1/entries/upload": MAX_ENTRY_FILE_SIZE,
+        "/api/v1/reflections/upload": MAX_REFLECTION_FILE_SIZE,
+    }
+)
+
+# Log unexpected errors once and map them to a 500 response
+app.add_middleware(UnhandledErrorMiddleware)
+
+# Add CORS middleware last so it wraps every response above, including the
+# 413s and 500s produced by the middlewares themselves
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
 # Database connection events
 @app.on_event("startup")
 async def startup_event():
-    """Connect to MongoDB on startup"""
+    """Connect to MongoDB and Redis on startup"""
     await connect_to_mongo()
+    await ensure_indexes()
+    await connect_to_redis()
+    
+    # Shared stateless repositories/services, injected through app.api.v1.deps
+    app.state.file_storage = FileStorageService()
+    app.state.reflection_repo = ReflectionSourceRepository()
+    app.state.insight_repo = InsightRepository()
+    app.state.user_service = UserService()
+    app.state.profile_service = ProfileService()
+    app.state.invitation_service = ClerkInvitationService()
+    app.state.entry_service = EntryService()
+    app.state.freemium_service = FreemiumService()
+    app.state.text_extraction_service = TextExtractionService()
     logger.info("Application startup complete")
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close MongoDB connection on shutdown"""
+    """Close MongoDB and Redis connections and worker pools on shutdown"""
     await close_mongo_connection()
+    await close_redis_connection()
+    shutdown_pdf_executor()
     logger.info("Application shutdown complete")
 
 # Include routers
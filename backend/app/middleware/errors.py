@@ -0,0 +1,48 @@
+"""
+Unhandled error middleware
+
+Turns exceptions that escape the routes into a JSON 500 response. Starlette
+runs app-level Exception handlers in its outermost middleware, outside
+CORSMiddleware, so their responses carried no CORS headers and browsers
+reported them as network errors. Mounted inside CORSMiddleware, this one's
+responses get the same CORS headers as any other.
+"""
+
+import logging
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class UnhandledErrorMiddleware:
+    """Pure ASGI middleware mapping unhandled exceptions to a 500 response"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error(f"❌ Unhandled error on {scope['method']} {scope['path']}: {exc}", exc_info=exc)
+            if response_started:
+                # Too late to replace the response; let the server drop the connection
+                raise
+            response = JSONResponse(
+                status_code=500,
+                content={"detail": "Internal server error"}
+            )
+            await response(scope, receive, send)
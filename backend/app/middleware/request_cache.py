@@ -0,0 +1,28 @@
+"""
+Request-scoped cache middleware
+
+Gives every HTTP request a fresh profile lookup cache, so repeated
+ProfileRepository.get_profile_by_clerk_id calls made by the handler and the
+services it uses hit MongoDB only once per user per request.
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.repositories.profile_repository import request_profile_cache
+
+
+class RequestProfileCacheMiddleware:
+    """Pure ASGI middleware that scopes the profile cache to one request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_profile_cache.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_profile_cache.reset(token)
@@ -0,0 +1,48 @@
+"""
+Upload size limit middleware
+
+Rejects oversized uploads from their Content-Length header before FastAPI
+starts reading and spooling the multipart body. The upload handlers still
+enforce the limit while streaming, for clients that omit the header or use
+chunked transfer encoding.
+"""
+
+from typing import Dict
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Headroom for multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Pure ASGI middleware enforcing per-path upload size limits"""
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        self.limits = {path: limit + MULTIPART_OVERHEAD_ALLOWANCE for path, limit in limits.items()}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limit = self.limits.get(scope["path"])
+            if limit is not None:
+                content_length = self._content_length(scope)
+                if content_length is not None and content_length > limit:
+                    response = JSONResponse(
+                        status_code=413,
+                        content={"detail": f"File size must be less than {(limit - MULTIPART_OVERHEAD_ALLOWANCE) // (1024 * 1024)}MB"}
+                    )
+                    await response(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _content_length(scope: Scope):
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
@@ -17,10 +17,13 @@ class ReflectionSource(ProcessableDocument):
     """Complete reflection source model for MongoDB persistence"""
     title: str = Field(..., description="Title or name of the reflection source")
     description: Optional[str] = Field(default=None, description="Optional description")
-    content: str = Field(..., description="Extracted text content")
+    content: str = Field(default="", description="Extracted text content (empty when stored in content_uri)")
+    content_uri: Optional[str] = Field(default=None, description="Location of the externally stored extracted text")
+    content_excerpt: Optional[str] = Field(default=None, description="Leading excerpt of externally stored content for list views")
     original_filename: Optional[str] = Field(default=None, description="Original uploaded filename")
     file_path: Optional[str] = Field(default=None, description="Path to stored file")
     file_size: Optional[int] = Field(default=None, description="File size in bytes")
+    content_hash: Optional[str] = Field(default=None, description="SHA-256 hex digest of the uploaded file")
     content_type: Optional[str] = Field(default=None, description="MIME type of uploaded file")
     document_type: Optional[DocumentType] = Field(default=None, description="Type of document")
     document_analysis: Optional[DocumentAnalysis] = Field(default=None, description="AI analysis of document")
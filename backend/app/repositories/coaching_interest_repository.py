@@ -4,10 +4,17 @@ from datetime import datetime
 from app.models.coaching_interest import CoachingInterest
 from app.schemas.coaching_interest import CoachingInterestCreate
 from app.db.mongodb import get_database
+from app.core.cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# The admin submission list is re-read on every page load but only changes
+# when someone submits the interest form; create() drops the cached list
+ALL_SUBMISSIONS_CACHE_TTL_SECONDS = 30
+_all_submissions_cache = TTLCache(maxsize=1, ttl_seconds=ALL_SUBMISSIONS_CACHE_TTL_SECONDS)
+_ALL_SUBMISSIONS_KEY = "all"
+
 
 class CoachingInterestRepository:
     def __init__(self):
@@ -43,6 +50,7 @@ class CoachingInterestRepository:
             
             logger.info("Attempting to insert coaching interest submission into database...")
             result = await db[self.collection_name].insert_one(submission_dict)
+            _all_submissions_cache.invalidate(_ALL_SUBMISSIONS_KEY)
             logger.info(f"Insert result: {result}")
             logger.info(f"Inserted ID: {result.inserted_id}")
             
@@ -63,7 +71,12 @@ class CoachingInterestRepository:
             raise
 
     async def get_all(self) -> List[CoachingInterest]:
-        """Retrieve all coaching interest submissions"""
+        """Retrieve all coaching interest submissions, newest first"""
+        cached = _all_submissions_cache.get(_ALL_SUBMISSIONS_KEY)
+        if cached is not None:
+            # Copy so callers can't reorder or extend the shared list
+            return list(cached)
+        
         logger.info(f"=== CoachingInterestRepository.get_all called ===")
         
         try:
@@ -80,17 +93,13 @@ class CoachingInterestRepository:
             
             logger.info(f"Found {len(submissions_docs)} coaching interest submissions")
             
-            submissions = []
-            for doc in submissions_docs:
-                # Convert ObjectId to string for Pydantic compatibility
-                if "_id" in doc and doc["_id"]:
-                    doc["_id"] = str(doc["_id"])
-                
-                submission = CoachingInterest(**doc)
-                submissions.append(submission)
+            # Documents were validated by create() before they were stored,
+            # so skip re-validating every field (EmailStr included) per row
+            submissions = [CoachingInterest.model_construct(**doc) for doc in submissions_docs]
             
             logger.info(f"✅ Successfully retrieved {len(submissions)} coaching interest submissions")
-            return submissions
+            _all_submissions_cache.set(_ALL_SUBMISSIONS_KEY, submissions)
+            return list(submissions)
             
         except Exception as e:
             logger.error(f"❌ Error in get_all: {e}")
@@ -161,6 +161,11 @@ class EntryRepository:
             logger.error(f"Error counting entries for user {user_id}: {e}")
             return 0
 
+    async def get_latest_entry_by_user(self, user_id: str) -> Optional[Entry]:
+        """Get the most recently created entry for a user"""
+        entries = await self.get_entries_by_user(user_id, limit=1)
+        return entries[0] if entries else None
+
     async def accept_detected_goals(self, entry_id: str, accepted_goal_indices: List[int]) -> bool:
         """Mark detected goals as accepted"""
         try:
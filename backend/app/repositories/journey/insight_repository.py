@@ -1,6 +1,7 @@
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
 from app.db.mongodb import get_database
+from app.db.redis import bump_cache_version, JOURNEY_CACHE_NAMESPACE
 from app.models.journey.insight import Insight
 from app.models.journey.enums import CategoryType
 
@@ -10,6 +11,15 @@ class InsightRepository:
     def __init__(self):
         self.collection_name = Insight.Config.collection_name
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing the per-user insight queries."""
+        db = get_database()
+        collection = db[self.collection_name]
+        # Sort direction matches the created_at desc sort used by every list query
+        await collection.create_index([("user_id", 1), ("category", 1), ("created_at", -1)])
+        await collection.create_index([("user_id", 1), ("created_at", -1)])
+        await collection.create_index([("source_id", 1)])
+
     async def create(self, insight: Insight) -> Insight:
         """Create a new insight."""
         db = get_database()
@@ -19,8 +29,36 @@ class InsightRepository:
 
         result = await db[self.collection_name].insert_one(insight_dict)
         insight.id = str(result.inserted_id)
+        await bump_cache_version(JOURNEY_CACHE_NAMESPACE, insight.user_id)
         return insight
 
+    async def create_many(self, insights: List[Insight]) -> List[Insight]:
+        """Create several insights with a single insert_many round trip."""
+        if not insights:
+            return []
+        db = get_database()
+        insight_dicts = []
+        for insight in insights:
+            insight_dict = insight.model_dump(by_alias=True, exclude_unset=True)
+            if "_id" in insight_dict and insight_dict["_id"] is None:
+                del insight_dict["_id"]
+            insight_dicts.append(insight_dict)
+
+        result = await db[self.collection_name].insert_many(insight_dicts, ordered=False)
+        for insight, inserted_id in zip(insights, result.inserted_ids):
+            insight.id = str(inserted_id)
+        for user_id in {insight.user_id for insight in insights}:
+            await bump_cache_version(JOURNEY_CACHE_NAMESPACE, user_id)
+        return insights
+
+    async def delete_by_source_id(self, user_id: str, source_id: str) -> int:
+        """Delete every insight generated from a source and return how many were removed."""
+        db = get_database()
+        result = await db[self.collection_name].delete_many({"source_id": source_id})
+        if result.deleted_count:
+            await bump_cache_version(JOURNEY_CACHE_NAMESPACE, user_id)
+        return result.deleted_count
+
     async def get_by_id(self, insight_id: str) -> Optional[Insight]:
         """Get an insight by its ID."""
         db = get_database()
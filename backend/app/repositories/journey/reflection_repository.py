@@ -1,9 +1,20 @@
+import asyncio
+import logging
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.db.mongodb import get_database
+from app.db.redis import bump_cache_version, JOURNEY_CACHE_NAMESPACE
+from app.models.journey.enums import ProcessingStatus
 from app.models.journey.reflection import ReflectionSource
 
+logger = logging.getLogger(__name__)
+
+def _read_text_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as text_file:
+        return text_file.read()
+
 class ReflectionSourceRepository:
     """Repository for managing reflection sources in MongoDB."""
 
@@ -12,6 +23,21 @@ class ReflectionSourceRepository:
         self.db = get_database()
         self.collection_name = ReflectionSource.Config.collection_name
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing the per-user reflection queries."""
+        collection = self.db[self.collection_name]
+        await collection.create_index([("user_id", 1), ("created_at", -1)])
+        await collection.create_index([("user_id", 1), ("categories", 1), ("created_at", -1)])
+
+    async def ensure_content_hash_index(self) -> None:
+        """Create the unique index that rejects a second upload of the same file."""
+        # One reflection per uploaded file per user; text reflections have no hash
+        await self.db[self.collection_name].create_index(
+            [("user_id", 1), ("content_hash", 1)],
+            unique=True,
+            partialFilterExpression={"content_hash": {"$type": "string"}}
+        )
+
     async def create(self, reflection_source: ReflectionSource) -> ReflectionSource:
         """Create a new reflection source."""
         reflection_dict = reflection_source.model_dump(by_alias=True, exclude_unset=True)
@@ -20,6 +46,7 @@ class ReflectionSourceRepository:
         
         result = await self.db[self.collection_name].insert_one(reflection_dict)
         reflection_source.id = str(result.inserted_id)
+        await bump_cache_version(JOURNEY_CACHE_NAMESPACE, reflection_source.user_id)
         return reflection_source
 
     async def get_by_id(self, id: str) -> Optional[ReflectionSource]:
@@ -33,6 +60,14 @@ class ReflectionSourceRepository:
         except Exception:
             return None
 
+    async def get_by_content_hash(self, user_id: str, content_hash: str) -> Optional[ReflectionSource]:
+        """Get a user's reflection source created from a file with the given SHA-256 digest."""
+        doc = await self.db[self.collection_name].find_one({"user_id": user_id, "content_hash": content_hash})
+        if doc:
+            doc["_id"] = str(doc["_id"])
+            return ReflectionSource(**doc)
+        return None
+
     async def get_by_user_id(self, user_id: str) -> List[ReflectionSource]:
         """Get all reflection sources for a given user_id."""
         cursor = self.db[self.collection_name].find({"user_id": user_id}).sort("created_at", -1)
@@ -43,6 +78,128 @@ class ReflectionSourceRepository:
                 doc["_id"] = str(doc["_id"])
         return [ReflectionSource(**doc) for doc in docs]
 
+    async def get_insights_projected(
+        self, user_id: str, skip: int = 0, limit: int = 50, preview_length: int = 201,
+        include_content: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Get one page of the list-view fields of a user's reflection sources, newest first.
+        
+        Projection happens server-side: a preview of the text (inline content,
+        or the excerpt when content is stored externally) and the categorized
+        insights are returned, never the whole analysis document. With
+        include_content, the inline content and its external location (see
+        with_full_content) are returned as well.
+        """
+        projection = {
+            "title": 1,
+            "preview": {"$substrCP": [
+                {"$cond": [
+                    {"$gt": [{"$strLenCP": {"$ifNull": ["$content", ""]}}, 0]},
+                    "$content",
+                    {"$ifNull": ["$content_excerpt", ""]}
+                ]},
+                0,
+                preview_length
+            ]},
+            "categories": 1,
+            "tags": 1,
+            "processing_status": 1,
+            "word_count": 1,
+            "document_type": 1,
+            "original_filename": 1,
+            "categorized_insights": "$document_analysis.categorized_insights",
+            "created_at": 1,
+            "updated_at": 1
+        }
+        if include_content:
+            projection.update({"content": 1, "content_uri": 1})
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$sort": {"created_at": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$project": projection}
+        ]
+        cursor = self.db[self.collection_name].aggregate(pipeline)
+        return await cursor.to_list(length=limit)
+
+    def get_feed_page_cursor(
+        self, user_id: str, skip: int = 0, limit: int = 20, preview_length: int = 160,
+        include_content: bool = False
+    ):
+        """
+        Get a cursor over one page of a user's reflections for the feed, newest first.
+        
+        Uses the (user_id, created_at) index and returns the title,
+        timestamps and a short text preview. With include_content, the inline
+        content and its location when stored externally (see
+        with_full_content) are returned as well.
+        """
+        projection = {
+            "title": 1,
+            "preview": {"$substrCP": [
+                {"$cond": [
+                    {"$gt": [{"$strLenCP": {"$ifNull": ["$content", ""]}}, 0]},
+                    "$content",
+                    {"$ifNull": ["$content_excerpt", ""]}
+                ]},
+                0,
+                preview_length
+            ]},
+            "created_at": 1,
+            "updated_at": 1
+        }
+        if include_content:
+            projection.update({"content": 1, "content_uri": 1})
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$sort": {"created_at": -1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$project": projection}
+        ]
+        return self.db[self.collection_name].aggregate(pipeline)
+
+    async def get_feed_page(
+        self, user_id: str, skip: int = 0, limit: int = 20, include_content: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Get one projected page of a user's reflections for the feed."""
+        cursor = self.get_feed_page_cursor(user_id, skip=skip, limit=limit, include_content=include_content)
+        return await cursor.to_list(length=limit)
+
+    async def with_full_content(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fill in "content" on projected documents whose text is stored externally.
+        
+        Files are read concurrently off the event loop. A file that cannot be
+        read falls back to the document's preview so one bad upload does not
+        fail the whole list.
+        """
+        external = [doc for doc in docs if not doc.get("content") and doc.get("content_uri")]
+        if external:
+            texts = await asyncio.gather(
+                *(asyncio.to_thread(_read_text_file, doc["content_uri"]) for doc in external),
+                return_exceptions=True
+            )
+            for doc, text in zip(external, texts):
+                if isinstance(text, Exception):
+                    logger.warning(f"Could not read content for reflection {doc.get('_id')}: {text}")
+                    text = doc.get("preview") or ""
+                doc["content"] = text
+        return docs
+
+    async def fetch_content(self, reflection_source: ReflectionSource) -> str:
+        """
+        Get the full extracted text of a reflection source.
+        
+        Content is kept inline for text reflections; uploaded documents store
+        it externally at content_uri and only load it when actually needed.
+        """
+        if reflection_source.content_uri:
+            return await asyncio.to_thread(_read_text_file, reflection_source.content_uri)
+        return reflection_source.content
+
     async def update(self, id: str, reflection_source_update: dict) -> Optional[ReflectionSource]:
         """Update a reflection source by its ID using the provided dictionary of update fields."""
         try:
@@ -55,16 +212,47 @@ class ReflectionSourceRepository:
                 {"$set": reflection_source_update}
             )
             if result.modified_count:
-                return await self.get_by_id(id)
+                updated = await self.get_by_id(id)
+                if updated:
+                    await bump_cache_version(JOURNEY_CACHE_NAMESPACE, updated.user_id)
+                return updated
             return None
         except Exception:
             return None
 
+    async def claim_failed_for_retry(self, id: str) -> bool:
+        """
+        Move a failed reflection source back to pending, atomically.
+        
+        Only one of several concurrent callers can match the FAILED status,
+        so only that caller should queue the retry.
+        
+        Returns:
+            True if this call moved the reflection to pending
+        """
+        claimed = await self.db[self.collection_name].find_one_and_update(
+            {"_id": ObjectId(id), "processing_status": ProcessingStatus.FAILED},
+            {"$set": {
+                "processing_status": ProcessingStatus.PENDING,
+                "processing_errors": None,
+                "updated_at": datetime.utcnow()
+            }},
+            projection={"user_id": 1}
+        )
+        if claimed:
+            await bump_cache_version(JOURNEY_CACHE_NAMESPACE, claimed["user_id"])
+        return claimed is not None
+
     async def delete(self, id: str) -> bool:
         """Delete a reflection source by its ID and return True if successful, False otherwise."""
         try:
-            result = await self.db[self.collection_name].delete_one({"_id": ObjectId(id)})
-            return result.deleted_count > 0
+            deleted = await self.db[self.collection_name].find_one_and_delete(
+                {"_id": ObjectId(id)},
+                projection={"user_id": 1}
+            )
+            if deleted:
+                await bump_cache_version(JOURNEY_CACHE_NAMESPACE, deleted["user_id"])
+            return deleted is not None
         except Exception:
             return False
 
@@ -86,7 +274,26 @@ class ReflectionSourceRepository:
                 {"$addToSet": {"insight_ids": insight_id}}
             )
             if result.modified_count:
-                return await self.get_by_id(reflection_id)
+                updated = await self.get_by_id(reflection_id)
+                if updated:
+                    await bump_cache_version(JOURNEY_CACHE_NAMESPACE, updated.user_id)
+                return updated
+            return None
+        except Exception:
+            return None
+
+    async def add_insight_ids(self, reflection_id: str, insight_ids: List[str]) -> Optional[ReflectionSource]:
+        """Add several insight IDs to a reflection's insight_ids list in one update."""
+        try:
+            result = await self.db[self.collection_name].update_one(
+                {"_id": ObjectId(reflection_id)},
+                {"$addToSet": {"insight_ids": {"$each": insight_ids}}}
+            )
+            if result.modified_count:
+                updated = await self.get_by_id(reflection_id)
+                if updated:
+                    await bump_cache_version(JOURNEY_CACHE_NAMESPACE, updated.user_id)
+                return updated
             return None
         except Exception:
             return None
@@ -1,16 +1,61 @@
-from typing import Optional
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from app.models.profile import Profile
+from app.core.cache import SingleFlight
 from app.db.mongodb import get_database
+from app.db.redis import bump_cache_version, get_cache_version, PROFILE_CACHE_NAMESPACE
+
+# Profiles already loaded during the current request, keyed by clerk_user_id.
+# RequestProfileCacheMiddleware sets a fresh dict per request; outside a
+# request (default None) every lookup goes to MongoDB.
+request_profile_cache: ContextVar[Optional[Dict[str, Optional[Profile]]]] = ContextVar(
+    "request_profile_cache", default=None
+)
+
+
+# Profile lookups currently in flight across all requests, keyed by
+# clerk_user_id, so concurrent reads (e.g. several endpoints fetched in
+# parallel after login) share one MongoDB query
+_profile_inflight = SingleFlight()
+
+
+def _forget_cached_profile(clerk_user_id: str) -> None:
+    cache = request_profile_cache.get()
+    if cache is not None:
+        cache.pop(clerk_user_id, None)
+    # Reads started after a write must not join a lookup issued before it
+    _profile_inflight.forget(clerk_user_id)
+
+
+async def profile_cache_key(clerk_user_id: str) -> str:
+    """
+    Redis key for a user's cached /me/profile response.
+    
+    The key embeds the user's profile cache version, which every write
+    bumps. Callers fetch the key before reading MongoDB, so a read that
+    overlaps a write stores its stale body under the old version, where no
+    later request looks.
+    """
+    version = await get_cache_version(PROFILE_CACHE_NAMESPACE, clerk_user_id)
+    return f"{PROFILE_CACHE_NAMESPACE}:{clerk_user_id}:{version}"
 
 
 class ProfileRepository:
     def __init__(self):
         self.collection_name = "profiles"
 
+    async def ensure_indexes(self) -> None:
+        """Create the index backing every clerk_user_id lookup"""
+        db = get_database()
+        # One profile per Clerk user; also serves the $in batch lookup
+        await db[self.collection_name].create_index([("clerk_user_id", 1)], unique=True)
+
     async def create_profile(self, profile: Profile) -> Profile:
-        """Create a new profile"""
+        """Create a new profile; raises DuplicateKeyError if the user already has one"""
         db = get_database()
         # FIX: Use model_dump() instead of deprecated dict() method for Pydantic v2
         profile_dict = profile.model_dump(by_alias=True, exclude_unset=True)
@@ -19,22 +64,66 @@ class ProfileRepository:
         if "_id" in profile_dict and profile_dict["_id"] is None:
             del profile_dict["_id"]
             
-        result = await db[self.collection_name].insert_one(profile_dict)
+        try:
+            result = await db[self.collection_name].insert_one(profile_dict)
+        except DuplicateKeyError:
+            # A "not found" remembered earlier in this request is now stale
+            _forget_cached_profile(profile.clerk_user_id)
+            raise
         profile.id = result.inserted_id
+        _forget_cached_profile(profile.clerk_user_id)
+        await bump_cache_version(PROFILE_CACHE_NAMESPACE, profile.clerk_user_id)
         return profile
 
 
     async def get_profile_by_clerk_id(self, clerk_user_id: str) -> Optional[Profile]:
-        """Get profile by Clerk user ID"""
+        """Get profile by Clerk user ID, reusing a lookup made earlier in the same request"""
+        cache = request_profile_cache.get()
+        if cache is not None and clerk_user_id in cache:
+            return cache[clerk_user_id]
+        
+        profile_doc = await _profile_inflight.run(
+            clerk_user_id, lambda: self._find_profile_doc(clerk_user_id)
+        )
+        
+        # Each caller gets its own model, since callers may modify it
+        profile = Profile(**profile_doc) if profile_doc else None
+        
+        if cache is not None:
+            cache[clerk_user_id] = profile
+        return profile
+
+    async def _find_profile_doc(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
         db = get_database()
         profile_doc = await db[self.collection_name].find_one({"clerk_user_id": clerk_user_id})
+        # Convert ObjectId to string for Pydantic compatibility
+        if profile_doc and profile_doc.get("_id"):
+            profile_doc["_id"] = str(profile_doc["_id"])
+        return profile_doc
+
+    async def get_profiles_by_clerk_ids(self, clerk_user_ids: List[str]) -> Dict[str, Profile]:
+        """Get profiles for several Clerk user IDs in one query, keyed by clerk_user_id"""
+        cache = request_profile_cache.get()
+        profiles = {}
+        missing_ids = set(clerk_user_ids)
+        if cache is not None:
+            for clerk_user_id in missing_ids & cache.keys():
+                if cache[clerk_user_id] is not None:
+                    profiles[clerk_user_id] = cache[clerk_user_id]
+            missing_ids -= cache.keys()
         
-        if profile_doc:
-            # Convert ObjectId to string for Pydantic compatibility
-            if "_id" in profile_doc and profile_doc["_id"]:
-                profile_doc["_id"] = str(profile_doc["_id"])
-            return Profile(**profile_doc)
-        return None
+        if missing_ids:
+            db = get_database()
+            async for profile_doc in db[self.collection_name].find({"clerk_user_id": {"$in": list(missing_ids)}}):
+                # Convert ObjectId to string for Pydantic compatibility
+                if "_id" in profile_doc and profile_doc["_id"]:
+                    profile_doc["_id"] = str(profile_doc["_id"])
+                profiles[profile_doc["clerk_user_id"]] = Profile(**profile_doc)
+            
+            if cache is not None:
+                for clerk_user_id in missing_ids:
+                    cache[clerk_user_id] = profiles.get(clerk_user_id)
+        return profiles
 
     async def get_profile_by_id(self, profile_id: str) -> Optional[Profile]:
         """Get profile by ID"""
@@ -52,19 +141,27 @@ class ProfileRepository:
         # Add updated_at timestamp
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await db[self.collection_name].update_one(
+        # Update and read back in one round trip
+        profile_doc = await db[self.collection_name].find_one_and_update(
             {"clerk_user_id": clerk_user_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
         )
+        _forget_cached_profile(clerk_user_id)
+        await bump_cache_version(PROFILE_CACHE_NAMESPACE, clerk_user_id)
         
-        if result.modified_count:
-            return await self.get_profile_by_clerk_id(clerk_user_id)
-        return None
+        if not profile_doc:
+            return None
+        # Convert ObjectId to string for Pydantic compatibility
+        profile_doc["_id"] = str(profile_doc["_id"])
+        return Profile(**profile_doc)
 
     async def delete_profile_by_clerk_id(self, clerk_user_id: str) -> bool:
         """Delete profile by clerk_user_id"""
         db = get_database()
         result = await db[self.collection_name].delete_one({"clerk_user_id": clerk_user_id})
+        _forget_cached_profile(clerk_user_id)
+        await bump_cache_version(PROFILE_CACHE_NAMESPACE, clerk_user_id)
         return result.deleted_count > 0
 
     async def profile_exists_by_clerk_id(self, clerk_user_id: str) -> bool:
@@ -9,6 +9,7 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 
 from app.models.journey.enums import CategoryType, ReviewStatus, ProcessingStatus
+from app.models.journey.reflection import ReflectionSource
 
 
 # Request Schemas
@@ -79,6 +80,17 @@ class ReflectionResponse(BaseModel):
     updated_at: datetime = Field(..., description="When the reflection was last updated")
 
 
+class ReflectionSourceResponse(ReflectionSource):
+    """
+    Schema for reflection source responses.
+    
+    `content` holds the full text in detail views and, for uploaded documents
+    whose text is stored externally, the leading excerpt in list views. The
+    storage location itself stays server-side.
+    """
+    content_uri: Optional[str] = Field(default=None, exclude=True)
+
+
 class ReflectionWithInsightsResponse(BaseModel):
     """Schema for reflection with its insights"""
     reflection: ReflectionResponse = Field(..., description="The reflection data")
@@ -92,6 +104,7 @@ class JourneyFeedItem(BaseModel):
     id: str = Field(..., description="Unique identifier")
     title: str = Field(..., description="Title of the item")
     content: Optional[str] = Field(default=None, description="Content of the item")
+    preview: Optional[str] = Field(default=None, description="Leading excerpt of the content (for reflections)")
     summary: Optional[str] = Field(default=None, description="Summary (for insights)")
     description: Optional[str] = Field(default=None, description="Description (for reflections)")
     categories: Optional[List[CategoryType]] = Field(default=None, description="Categories (for reflections)")
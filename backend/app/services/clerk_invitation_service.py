@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 import httpx
 from app.core.config import settings
@@ -7,6 +8,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _clerk_timestamp_to_iso(value: Optional[int]) -> Optional[str]:
+    """Convert a Clerk millisecond timestamp to the ISO 8601 string the relationship responses declare"""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).isoformat()
+
+
 class ClerkInvitationService:
     """Service for managing Clerk invitations for coaching relationships"""
     
@@ -143,7 +151,7 @@ class ClerkInvitationService:
                                 "client_name": f"{user_data.get('first_name', '')} {user_data.get('last_name', '')}".strip(),
                                 "client_email": user_data.get("email_addresses", [{}])[0].get("email_address"),
                                 "relationship_status": "active",
-                                "started_at": membership.get("created_at"),
+                                "started_at": _clerk_timestamp_to_iso(membership.get("created_at")),
                                 "clerk_membership_id": membership.get("id")
                             })
                 
@@ -158,7 +166,7 @@ class ClerkInvitationService:
                                 "client_email": invitation["email_address"],
                                 "client_name": f"{metadata.get('client_first_name', '')} {metadata.get('client_last_name', '')}".strip(),
                                 "status": invitation["status"],
-                                "expires_at": invitation.get("expires_at"),
+                                "expires_at": _clerk_timestamp_to_iso(invitation.get("expires_at")),
                                 "message": metadata.get("message")
                             })
                 
@@ -198,7 +206,7 @@ class ClerkInvitationService:
                             "coach_organization_id": org.get("id"),
                             "coach_organization_name": org.get("name"),
                             "relationship_status": "active",
-                            "joined_at": membership.get("created_at"),
+                            "joined_at": _clerk_timestamp_to_iso(membership.get("created_at")),
                             "role": membership.get("role"),
                             "coach_specialties": org_metadata.get("specialties", []),
                             "coach_website": org_metadata.get("website")
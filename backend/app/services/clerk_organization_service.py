@@ -383,55 +383,67 @@ class ClerkOrganizationService:
     async def get_user_permissions(self, user_id: str) -> List[str]:
         """Get all permissions for a user based on their organization roles"""
         try:
-            roles_info = await self.get_user_roles_in_organizations(user_id)
+            organizations = await self.get_user_organizations(user_id)
+            return self.permissions_for_organizations(organizations)
+        except Exception as e:
+            logger.error(f"Error getting user permissions: {str(e)}")
+            raise
+    
+    @staticmethod
+    def permissions_for_organizations(organizations: List[Dict[str, Any]]) -> List[str]:
+        """
+        Derive a user's permissions from their organization memberships.
+        
+        Args:
+            organizations: Memberships as returned by get_user_organizations
             
-            permissions = set()
+        Returns:
+            Permissions granted by the user's roles and organization types
+        """
+        permissions = set()
+        
+        for org in organizations:
+            role = org["role"]
+            # Memberships embed the organization's private metadata
+            org_type = (org.get("metadata") or {}).get("organization_type", "unknown")
             
-            for role_info in roles_info:
-                role = role_info["role"]
-                org_type = role_info["org_type"]
-                
-                # Add permissions based on role and organization type
-                if role == "admin":
-                    if org_type == "coach_practice":
-                        permissions.update([
-                            "coaching_relationships:manage",
-                            "client_data:read",
-                            "resources:create",
-                            "clients:invite",
-                            "org_members:manage",
-                            "org_settings:manage"
-                        ])
-                    elif org_type == "client_company":
-                        permissions.update([
-                            "org_members:manage",
-                            "org_settings:manage",
-                            "coaches:connect"
-                        ])
-                    else:  # Arete organization admin
-                        permissions.update([
-                            "platform:manage",
-                            "users:manage",
-                            "organizations:manage"
-                        ])
-                
-                elif role == "coach":
+            # Add permissions based on role and organization type
+            if role == "admin":
+                if org_type == "coach_practice":
                     permissions.update([
                         "coaching_relationships:manage",
                         "client_data:read",
                         "resources:create",
-                        "clients:invite"
+                        "clients:invite",
+                        "org_members:manage",
+                        "org_settings:manage"
                     ])
-                
-                elif role == "basic_member" or role == "member":
+                elif org_type == "client_company":
+                    permissions.update([
+                        "org_members:manage",
+                        "org_settings:manage",
+                        "coaches:connect"
+                    ])
+                else:  # Arete organization admin
                     permissions.update([
-                        "profile:manage",
-                        "goals:manage",
-                        "progress:read"
+                        "platform:manage",
+                        "users:manage",
+                        "organizations:manage"
                     ])
             
-            return list(permissions)
+            elif role == "coach":
+                permissions.update([
+                    "coaching_relationships:manage",
+                    "client_data:read",
+                    "resources:create",
+                    "clients:invite"
+                ])
             
-        except Exception as e:
-            logger.error(f"Error getting user permissions: {str(e)}")
-            raise
\ No newline at end of file
+            elif role == "basic_member" or role == "member":
+                permissions.update([
+                    "profile:manage",
+                    "goals:manage",
+                    "progress:read"
+                ])
+        
+        return list(permissions)
\ No newline at end of file
@@ -4,6 +4,8 @@ from app.models.entry import Entry, EntryStatus, EntryType
 from app.repositories.entry_repository import EntryRepository
 from app.repositories.coaching_relationship_repository import CoachingRelationshipRepository
 from app.services.ai_service import AIService
+from app.services.freemium_service import FreemiumService
+from app.services.notification_service import NotificationService
 from app.services.text_extraction_service import TextExtractionService
 from app.core.config import settings
 import logging
@@ -399,7 +401,6 @@ class EntryService:
     async def _check_freemium_access(self, user_id: str, limit: int, offset: int) -> bool:
         """Check if user can access entries based on freemium status"""
         try:
-            from app.services.freemium_service import FreemiumService
             freemium_service = FreemiumService()
             
             freemium_status = await freemium_service.get_freemium_status(user_id)
@@ -421,7 +422,6 @@ class EntryService:
     async def _check_freemium_insights_access(self, user_id: str) -> bool:
         """Check if user can access detailed insights"""
         try:
-            from app.services.freemium_service import FreemiumService
             freemium_service = FreemiumService()
             
             freemium_status = await freemium_service.get_freemium_status(user_id)
@@ -436,7 +436,6 @@ class EntryService:
     async def _send_entry_notifications(self, entry: Entry):
         """Send notifications when entry is completed"""
         try:
-            from app.services.notification_service import NotificationService
             notification_service = NotificationService()
             
             # Notify the client
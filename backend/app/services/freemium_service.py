@@ -1,8 +1,12 @@
 from typing import Dict, Any, Optional
+from datetime import datetime
+from app.models.profile import FreemiumStatus
 from app.repositories.profile_repository import ProfileRepository
 from app.repositories.entry_repository import EntryRepository
 from app.repositories.coaching_relationship_repository import CoachingRelationshipRepository
+from app.services.notification_service import NotificationService
 import logging
+import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -154,7 +158,6 @@ class FreemiumService:
             freemium_status = await self.get_freemium_status(user_id)
             
             # Update coach request status
-            from datetime import datetime
             updated_status = freemium_status.copy()
             updated_status["coach_requested"] = True
             updated_status["coach_request_date"] = datetime.utcnow()
@@ -187,7 +190,6 @@ class FreemiumService:
             freemium_status = await self.get_freemium_status(user_id)
             
             # Update status to reflect coach assignment
-            from datetime import datetime
             updated_status = freemium_status.copy()
             updated_status["has_coach"] = True
             updated_status["coach_assigned_date"] = datetime.utcnow()
@@ -278,10 +280,6 @@ class FreemiumService:
             
             logger.info(f"Found profile with id: {profile.id}")
             
-            # Update freemium status
-            from app.models.profile import FreemiumStatus
-            from datetime import datetime
-            
             # Convert dict to FreemiumStatus model
             freemium_model = FreemiumStatus(**freemium_status)
             logger.info(f"Created FreemiumStatus model: {freemium_model.model_dump()}")
@@ -302,7 +300,6 @@ class FreemiumService:
         except Exception as e:
             logger.error(f"❌ Error updating profile freemium status: {e}")
             logger.error(f"Exception type: {type(e).__name__}")
-            import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
 
@@ -311,7 +308,6 @@ class FreemiumService:
         Send notification to admins about a coach request.
         """
         try:
-            from app.services.notification_service import NotificationService
             notification_service = NotificationService()
             
             # This would send notifications to admin users
@@ -1,11 +1,26 @@
 import os
 import uuid
+import hashlib
+from typing import NamedTuple
+import aiofiles
 from fastapi import UploadFile, HTTPException
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for reflection documents, enforced while the upload is written
+MAX_REFLECTION_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class StoredFile(NamedTuple):
+    """Result of streaming an upload to disk."""
+    path: str
+    size: int
+    sha256: str
+
+
 class FileStorageService:
     """Service for storing uploaded files."""
     def __init__(self, base_directory: str = "uploads"):
@@ -33,16 +48,20 @@ class FileStorageService:
             
         return file_path
 
-    def save_reflection_document(self, user_id: str, file: UploadFile) -> str:
+    async def save_reflection_document(self, user_id: str, file: UploadFile) -> StoredFile:
         """
         Saves a reflection document to a user-specific directory.
         
+        The upload is streamed to disk in fixed-size chunks, so memory use does
+        not grow with the file size. The size and SHA-256 digest are computed
+        in the same pass.
+        
         Args:
             user_id: The ID of the user uploading the file
             file: The uploaded file object
             
         Returns:
-            str: The absolute file path of the saved file
+            StoredFile: The absolute file path, size in bytes and SHA-256 hex digest
             
         Raises:
             HTTPException: If file operations fail
@@ -83,31 +102,68 @@ class FileStorageService:
                 file_path = os.path.join(user_directory, new_filename)
                 counter += 1
             
-            # Save the file
+            # Save the file in chunks, enforcing the size cap as bytes arrive
             try:
-                with open(file_path, "wb") as buffer:
-                    # Reset file pointer to beginning
-                    file.file.seek(0)
-                    content = file.file.read()
-                    if not content:
-                        raise HTTPException(status_code=400, detail="File is empty")
-                    buffer.write(content)
+                running_size = 0
+                digest = hashlib.sha256()
+                async with aiofiles.open(file_path, "wb") as buffer:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        running_size += len(chunk)
+                        if running_size > MAX_REFLECTION_FILE_SIZE:
+                            raise HTTPException(
+                                status_code=413,
+                                detail=f"File size must be less than {MAX_REFLECTION_FILE_SIZE // (1024 * 1024)}MB"
+                            )
+                        digest.update(chunk)
+                        await buffer.write(chunk)
+                
+                if running_size == 0:
+                    raise HTTPException(status_code=400, detail="File is empty")
                     
+            except HTTPException:
+                self.delete_file(file_path)
+                raise
             except OSError as e:
                 logger.error(f"Failed to write file {file_path}: {e}")
+                self.delete_file(file_path)
                 raise HTTPException(status_code=500, detail="Failed to save file")
             except Exception as e:
                 logger.error(f"Unexpected error saving file {file_path}: {e}")
+                self.delete_file(file_path)
                 raise HTTPException(status_code=500, detail="Failed to save file")
             
             # Return absolute path
             absolute_path = os.path.abspath(file_path)
             logger.info(f"Successfully saved reflection document to {absolute_path}")
-            return absolute_path
+            return StoredFile(path=absolute_path, size=running_size, sha256=digest.hexdigest())
             
         except HTTPException:
             # Re-raise HTTP exceptions as-is
             raise
         except Exception as e:
             logger.error(f"Unexpected error in save_reflection_document: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    def save_extracted_text(self, document_path: str, text: str) -> str:
+        """
+        Store the extracted text of a document next to the original upload.
+        
+        Args:
+            document_path: Path of the saved source document
+            text: Extracted text content
+            
+        Returns:
+            str: The absolute path of the stored text file
+        """
+        text_path = f"{document_path}.extracted.txt"
+        with open(text_path, "w", encoding="utf-8") as buffer:
+            buffer.write(text)
+        return os.path.abspath(text_path)
+
+    @staticmethod
+    def delete_file(file_path: str) -> None:
+        """Delete a stored file, ignoring files that are already gone."""
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
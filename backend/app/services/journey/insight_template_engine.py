@@ -760,6 +760,14 @@ class InsightTemplateEngine:
         return list(self.templates.keys())
 
 
+# The engine holds no per-reflection state, so a single instance is shared
+# across background tasks instead of being rebuilt for every reflection.
+_template_engine = InsightTemplateEngine(
+    user_context_service=None,  # Will be integrated later
+    goal_service=None  # Will be integrated later
+)
+
+
 async def process_reflection_ai(reflection_id: str) -> Dict[str, Any]:
     """
     Background task to process reflection and generate insights using the consolidated template engine.
@@ -785,14 +793,8 @@ async def process_reflection_ai(reflection_id: str) -> Dict[str, Any]:
         if not reflection:
             raise ValueError(f"Reflection not found: {reflection_id}")
         
-        # Initialize InsightTemplateEngine with mocked dependencies
-        template_engine = InsightTemplateEngine(
-            user_context_service=None,  # Will be integrated later
-            goal_service=None  # Will be integrated later
-        )
-        
-        # Generate insights using the consolidated template engine
-        insights = template_engine.generate_insights(reflection)
+        # Generate insights using the shared template engine
+        insights = _template_engine.generate_insights(reflection)
         
         # Calculate processing duration
         processing_duration = (datetime.utcnow() - start_time).total_seconds()
@@ -80,6 +80,9 @@ class JourneyService:
                 logger.warning(f"Reflection not found: {reflection_id}")
                 return None
             
+            # Detail view returns the full text, loading it from storage if needed
+            reflection.content = await self.reflection_repo.fetch_content(reflection)
+            
             # Get associated insights
             insights = await self.insight_repo.get_by_reflection_id(reflection_id)
             
@@ -125,7 +128,7 @@ class JourneyService:
                     "type": "reflection",
                     "id": str(reflection.id),
                     "title": reflection.title,
-                    "content": reflection.content,
+                    "content": reflection.content or reflection.content_excerpt,
                     "description": reflection.description,
                     "categories": reflection.categories,
                     "tags": reflection.tags,
@@ -1,28 +1,46 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple
+from clerk_backend_api import models
+from pymongo.errors import DuplicateKeyError
 from app.models.profile import Profile, CoachData, ClientData
 from app.repositories.profile_repository import ProfileRepository
 from app.services.user_service import UserService
+from app.db.redis import cache_delete
 from app.services.clerk_organization_service import ClerkOrganizationService
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class CoachLookup(NamedTuple):
+    """Clerk user registered with an email, and their profile if they have one"""
+    clerk_user: Optional[models.User]
+    profile: Optional[Profile]
+
+
+def coach_lookup_miss_key(email: str) -> str:
+    """Redis key recording that a coach email did not resolve to a set-up coach"""
+    return f"notcoach:{email}"
+
+
 class ProfileService:
     def __init__(self):
         self.profile_repository = ProfileRepository()
         self.user_service = UserService()
         self.clerk_org_service = ClerkOrganizationService()
 
-    async def create_profile(self, clerk_user_id: str, profile_data: Dict[str, Any]) -> Profile:
-        """Create a new profile for a user"""
+    async def create_profile(
+        self, clerk_user_id: str, profile_data: Dict[str, Any], email: Optional[str] = None
+    ) -> Profile:
+        """
+        Create a new profile for a user.
+        
+        The unique clerk_user_id index rejects a second profile, so callers
+        that may race another create should handle DuplicateKeyError.
+        email, when the caller knows it, clears cached coach lookup misses for
+        a new coach profile.
+        """
         try:
-            # Check if profile already exists
-            existing_profile = await self.profile_repository.get_profile_by_clerk_id(clerk_user_id)
-            if existing_profile:
-                logger.info(f"Profile for user {clerk_user_id} already exists")
-                return existing_profile
-
             # Validate role-specific data
             coach_data = None
             client_data = None
@@ -45,12 +63,52 @@ class ProfileService:
 
             created_profile = await self.profile_repository.create_profile(profile)
             logger.info(f"Created profile for user {clerk_user_id}")
+            if created_profile.coach_data:
+                await self.forget_coach_lookup_miss(email)
             return created_profile
 
+        except DuplicateKeyError:
+            logger.info(f"Profile for user {clerk_user_id} already exists")
+            raise
         except Exception as e:
             logger.error(f"Error creating profile: {e}")
             raise
 
+    async def get_coach_by_email(self, email: str) -> CoachLookup:
+        """
+        Look up a coach's Clerk user and profile from their email address.
+        
+        Users live in Clerk and profiles in MongoDB, so this stays two lookups;
+        the synchronous Clerk SDK call runs in a worker thread so it does not
+        block the event loop.
+        
+        Args:
+            email: Coach's email address
+            
+        Returns:
+            CoachLookup with clerk_user None if no Clerk user has the email
+        """
+        clerk_user = await asyncio.to_thread(self.user_service.get_user_by_email, email)
+        if not clerk_user:
+            return CoachLookup(clerk_user=None, profile=None)
+        
+        profile = await self.profile_repository.get_profile_by_clerk_id(clerk_user.id)
+        return CoachLookup(clerk_user=clerk_user, profile=profile)
+
+    async def forget_coach_lookup_miss(self, email: Optional[str]) -> None:
+        """
+        Drop the cached coach lookup miss for an email address.
+        
+        Called once the user has a coach profile, so client signups naming
+        them stop being rejected from the negative cache. Without an email
+        the miss simply expires after its TTL.
+        
+        Args:
+            email: The coach's email address, if known
+        """
+        if email:
+            await cache_delete(coach_lookup_miss_key(email.strip().lower()))
+
     async def get_profile_by_clerk_id(self, clerk_user_id: str) -> Optional[Profile]:
         """Get profile by Clerk user ID"""
         try:
@@ -64,8 +122,10 @@ class ProfileService:
             logger.error(f"Error getting profile by Clerk ID {clerk_user_id}: {e}")
             raise
 
-    async def update_profile(self, clerk_user_id: str, update_data: Dict[str, Any]) -> Optional[Profile]:
-        """Update profile by Clerk user ID"""
+    async def update_profile(
+        self, clerk_user_id: str, update_data: Dict[str, Any], email: Optional[str] = None
+    ) -> Optional[Profile]:
+        """Update profile by Clerk user ID; email is used as in create_profile"""
         try:
             # Validate and prepare update data
             validated_data = {}
@@ -84,14 +144,16 @@ class ProfileService:
 
             if primary_role == "coach" and "coach_data" in update_data:
                 coach_data = CoachData(**update_data["coach_data"])
-                validated_data["coach_data"] = coach_data.dict()
+                validated_data["coach_data"] = coach_data.model_dump()
             elif primary_role == "client" and "client_data" in update_data:
                 client_data = ClientData(**update_data["client_data"])
-                validated_data["client_data"] = client_data.dict()
+                validated_data["client_data"] = client_data.model_dump()
 
             updated_profile = await self.profile_repository.update_profile_by_clerk_id(clerk_user_id, validated_data)
             if updated_profile:
                 logger.info(f"Updated profile for user {clerk_user_id}")
+                if "coach_data" in validated_data:
+                    await self.forget_coach_lookup_miss(email)
             return updated_profile
 
         except Exception as e:
@@ -131,7 +193,8 @@ class ProfileService:
                 primary_role = organizations[0].get("role", "member")
 
             # Update Clerk user's public metadata
-            clerk_user = self.user_service.get_user(clerk_user_id)
+            # The Clerk SDK is synchronous; keep its HTTP calls off the event loop
+            clerk_user = await asyncio.to_thread(self.user_service.get_user, clerk_user_id)
             if clerk_user:
                 updated_metadata = clerk_user.public_metadata or {}
                 updated_metadata["primary_role"] = primary_role
@@ -140,8 +203,11 @@ class ProfileService:
                 org_roles = {org["id"]: {"role": org["role"]} for org in organizations}
                 updated_metadata["organization_roles"] = org_roles
 
-                from clerk_backend_api.services.users import Users
-                Users().update_user(user_id=clerk_user_id, public_metadata=updated_metadata)
+                await asyncio.to_thread(
+                    self.user_service.clerk_client.users.update_user,
+                    user_id=clerk_user_id,
+                    public_metadata=updated_metadata
+                )
                 logger.info(f"Updated Clerk public_metadata for user {clerk_user_id} with role '{primary_role}' and orgs.")
 
             # Prepare data for local profile update
@@ -165,10 +231,14 @@ class ProfileService:
                 profile_data = {
                     "first_name": public_user_data.get("first_name", ""),
                     "last_name": public_user_data.get("last_name", ""),
-                    "coach_data": CoachData().dict() if primary_role == "coach" else None,
-                    "client_data": ClientData().dict() if primary_role == "client" else None,
+                    "coach_data": CoachData().model_dump() if primary_role == "coach" else None,
+                    "client_data": ClientData().model_dump() if primary_role == "client" else None,
                 }
-                return await self.create_profile(clerk_user_id, profile_data)
+                try:
+                    return await self.create_profile(clerk_user_id, profile_data)
+                except DuplicateKeyError:
+                    # Created concurrently, e.g. by the first /me/profile request
+                    return await self.profile_repository.get_profile_by_clerk_id(clerk_user_id)
 
         except Exception as e:
             logger.error(f"Error syncing user role from Clerk for user {clerk_user_id}: {e}")
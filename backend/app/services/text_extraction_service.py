@@ -1,7 +1,61 @@
+import asyncio
+import io
+import multiprocessing
 import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, NamedTuple, Optional, Tuple
 from fastapi import UploadFile
 import pypdf
-from docx import Document
+from lxml import etree
+from starlette.concurrency import run_in_threadpool
+
+# PDFs with fewer pages than this are extracted inline; below it, re-parsing
+# the document in each worker costs more than the parallelism saves.
+PARALLEL_PDF_MIN_PAGES = 50
+# Pages handled by each pool task; every task re-opens the PDF once.
+PDF_PAGES_PER_TASK = 5
+
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+
+# WordprocessingML element tags read by the DOCX extractor
+_W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W_PARAGRAPH = f"{{{_W_NAMESPACE}}}p"
+_W_TEXT = f"{{{_W_NAMESPACE}}}t"
+
+_WORD_PATTERN = re.compile(r"\S+")
+
+
+class ExtractedText(NamedTuple):
+    """Extracted document text with its word and character counts."""
+    text: str
+    word_count: int
+    character_count: int
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Lazily create the process pool used for per-page PDF extraction.
+    
+    Workers are spawned rather than forked: forking the running server
+    would copy the event loop, open Mongo/Redis sockets and locks held by
+    other threads into every worker.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return _pdf_executor
+
+
+def shutdown_pdf_executor() -> None:
+    """Shut down the PDF extraction pool if it was started."""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        # Queued page batches are dropped; the server is going away anyway
+        _pdf_executor.shutdown(wait=True, cancel_futures=True)
+        _pdf_executor = None
+
 
 def save_uploaded_file(upload_file: UploadFile, destination_dir: str) -> str:
     """Saves an uploaded file to a destination directory."""
@@ -37,27 +91,61 @@ def extract_text(file_path: str) -> str:
         raise ValueError(f"Error extracting text from '{filename}': {str(e)}")
 
 
+def _extract_pdf_pages(args: Tuple[str, int, int]) -> str:
+    """Extract a range of PDF pages; runs inside a pool worker process."""
+    file_path, start, stop = args
+    with open(file_path, 'rb') as file:
+        pages = pypdf.PdfReader(file).pages
+        return "\n".join(pages[i].extract_text() for i in range(start, stop))
+
+
 def _extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file using pypdf."""
+    """
+    Extract text from PDF file using pypdf.
+    
+    Pages are independent once the document is parsed, so large PDFs are
+    split into page ranges that are extracted across a process pool.
+    """
     try:
-        text = ""
         with open(file_path, 'rb') as file:
             pdf_reader = pypdf.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
+            page_count = len(pdf_reader.pages)
+            if page_count < PARALLEL_PDF_MIN_PAGES:
+                texts = [page.extract_text() for page in pdf_reader.pages]
+            else:
+                texts = None
+        
+        if texts is None:
+            page_ranges = [
+                (file_path, start, min(start + PDF_PAGES_PER_TASK, page_count))
+                for start in range(0, page_count, PDF_PAGES_PER_TASK)
+            ]
+            texts = list(_get_pdf_executor().map(_extract_pdf_pages, page_ranges))
+        return "\n".join(texts).strip()
     except Exception as e:
         raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
 
 def _extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file using python-docx."""
+    """
+    Extract text from DOCX file by streaming word/document.xml.
+    
+    Only <w:t> runs are read, one line per <w:p> paragraph, and elements are
+    cleared as they are consumed, so memory stays flat regardless of size.
+    """
     try:
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        paragraphs = []
+        runs = []
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as document_xml:
+            for _, element in etree.iterparse(document_xml, events=("end",), tag=(_W_TEXT, _W_PARAGRAPH)):
+                if element.tag == _W_TEXT:
+                    if element.text:
+                        runs.append(element.text)
+                else:
+                    paragraphs.append("".join(runs))
+                    runs = []
+                    element.clear()
+        return "\n".join(paragraphs).strip()
     except Exception as e:
         raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
 
@@ -130,6 +218,30 @@ def extract_text_from_file(file_path: str) -> str:
         filename = os.path.basename(file_path) if file_path else "unknown"
         return f"Error processing file '{filename}': {str(e)}"
 
+def extract_text_with_counts(file_path: str) -> ExtractedText:
+    """
+    Extract text from a file together with its word and character counts.
+    
+    Words are counted by scanning the text in place rather than with
+    str.split(), which would build a list holding every word of the document.
+    """
+    text = extract_text_from_file(file_path) or ""
+    word_count = sum(1 for _ in _WORD_PATTERN.finditer(text))
+    return ExtractedText(text=text, word_count=word_count, character_count=len(text))
+
+def _extract_text_from_pdf_bytes(data: bytes) -> str:
+    """Extract text from in-memory PDF bytes; runs inside a pool worker process."""
+    pdf_reader = pypdf.PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() for page in pdf_reader.pages).strip()
+
+def _read_utf8_fileobj(fileobj: BinaryIO) -> str:
+    """Read a binary file object from the start and decode it as UTF-8."""
+    fileobj.seek(0)
+    try:
+        return fileobj.read().decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError("Text files must be UTF-8 encoded")
+
 class TextExtractionService:
     """Placeholder text extraction service for compatibility."""
     
@@ -143,4 +255,49 @@ class TextExtractionService:
             # For now, we'll just return a placeholder text.
             return f"Extracted text from: {filename}. This is a placeholder."
         except Exception as e:
-            return f"Error extracting text from {filename}: {e}"
\ No newline at end of file
+            return f"Error extracting text from {filename}: {e}"
+    
+    async def extract_text_from_fileobj(self, fileobj: BinaryIO, content_type: str) -> str:
+        """
+        Extract text content from an uploaded file object.
+        
+        PDFs are read into bytes and handed to the process pool; the caller
+        caps upload size, so the copy is bounded.
+        
+        Args:
+            fileobj: Seekable binary file object holding the upload
+            content_type: The caller's validated MIME type, used to pick the
+                extractor (filenames may lack an extension)
+            
+        Returns:
+            Extracted text
+            
+        Raises:
+            ValueError: If the PDF cannot be parsed, a text file is not UTF-8
+                or the content type is not supported
+        """
+        if content_type == "application/pdf":
+            fileobj.seek(0)
+            # Parsing is CPU-bound, so it runs in the PDF process pool rather
+            # than a thread that would still contend for the GIL
+            data = await run_in_threadpool(fileobj.read)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(_get_pdf_executor(), _extract_text_from_pdf_bytes, data)
+            except Exception as e:
+                raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+        if content_type == "text/plain":
+            return await self.read_text_fileobj(fileobj)
+        raise ValueError(f"Unsupported content type: {content_type}")
+    
+    async def read_text_fileobj(self, fileobj: BinaryIO) -> str:
+        """
+        Read a plain-text upload as UTF-8 without blocking the event loop.
+        
+        Spooled uploads may have rolled over to disk, so the read and decode
+        run in the threadpool.
+        
+        Raises:
+            ValueError: If the content is not valid UTF-8
+        """
+        return await run_in_threadpool(_read_utf8_fileobj, fileobj)
@@ -1,11 +1,39 @@
 from clerk_backend_api import Clerk, models
 from app.core.config import settings
+from app.core.cache import SingleFlight, TTLCache
+from app.db.redis import USER_CACHE_NAMESPACE
 from app.schemas.user import UserResponse
-from typing import Optional
+from app.services.clerk_organization_service import ClerkOrganizationService
+from typing import Optional, Dict, Any
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Role data changes on the order of minutes, so one lookup per user is shared
+# by the /me/roles, /me/permissions and /me/organizations endpoints
+USER_ROLES_CACHE_TTL_SECONDS = 60
+# Organization roles that grant coach-level access
+COACH_ORG_ROLES = frozenset({"admin", "coach"})
+_user_roles_cache = TTLCache(maxsize=10_000, ttl_seconds=USER_ROLES_CACHE_TTL_SECONDS)
+# Clerk lookups currently in flight, so concurrent cache misses for the same
+# user (e.g. the three /me endpoints at app bootstrap) share one fetch
+_user_roles_inflight = SingleFlight()
+
+def user_cache_key(clerk_user_id: str) -> str:
+    """Redis key for a user's cached /me response"""
+    return f"{USER_CACHE_NAMESPACE}:{clerk_user_id}"
+
+def get_primary_email(user: Optional[models.User]) -> Optional[str]:
+    """Return the user's primary email address, falling back to their first one"""
+    if not user or not user.email_addresses:
+        return None
+    return next(
+        (e.email_address for e in user.email_addresses if e.id == user.primary_email_address_id),
+        user.email_addresses[0].email_address
+    )
+
+
 class UserService:
     def __init__(self):
         self.clerk_client = Clerk()
@@ -38,12 +66,99 @@ class UserService:
             logger.error(f"Error fetching user by email from Clerk: {e}")
             return None
 
-    def get_all_users(self) -> Optional[list[models.User]]:
+    def get_all_users(self, limit: int = 100, offset: int = 0) -> Optional[list[models.User]]:
         """
-        Get all users from Clerk.
+        Get a page of users from Clerk.
         """
         try:
-            return self.clerk_client.users.list()
+            return self.clerk_client.users.list(limit=limit, offset=offset)
         except Exception as e:
             logger.error(f"Error fetching all users from Clerk: {e}")
             return None
+
+    def count_users(self) -> Optional[int]:
+        """
+        Get the total number of users in Clerk.
+        """
+        try:
+            return self.clerk_client.users.count().total_count
+        except Exception as e:
+            logger.error(f"Error counting users in Clerk: {e}")
+            return None
+
+    async def get_user_roles(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's primary role, organization roles and permissions.
+        
+        Results are cached per user for USER_ROLES_CACHE_TTL_SECONDS and
+        dropped early by invalidate_user_roles when Clerk reports a change.
+        Concurrent misses for the same user await a single Clerk lookup.
+        
+        Args:
+            clerk_user_id: Clerk user ID
+            
+        Returns:
+            Role data, or None if the user does not exist in Clerk
+        """
+        cached = _user_roles_cache.get(clerk_user_id)
+        if cached is not None:
+            return cached
+        
+        return await _user_roles_inflight.run(
+            clerk_user_id,
+            lambda: self._fetch_user_roles(clerk_user_id),
+            on_result=lambda roles: _cache_user_roles(clerk_user_id, roles),
+        )
+
+    async def _fetch_user_roles(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
+        """Load role data for a user from Clerk"""
+        user = await asyncio.to_thread(self.get_user, clerk_user_id)
+        if not user:
+            return None
+        
+        # One memberships call; permissions derive from the same list
+        organizations = await ClerkOrganizationService().get_user_organizations(clerk_user_id)
+        permissions = ClerkOrganizationService.permissions_for_organizations(organizations)
+        
+        email = get_primary_email(user)
+        
+        public_metadata = user.public_metadata or {}
+        if any(org["role"] in COACH_ORG_ROLES for org in organizations):
+            primary_role = "coach"
+        else:
+            primary_role = public_metadata.get("primary_role", "member")
+        
+        roles_data = {
+            "user_id": clerk_user_id,
+            "clerk_user_id": clerk_user_id,
+            "email": email,
+            "primary_role": primary_role,
+            "roles": sorted({org["role"] for org in organizations}),
+            "organization_roles": [
+                {"organization_id": org["id"], "organization_name": org["name"], "role": org["role"]}
+                for org in organizations
+            ],
+            "organization_memberships": [
+                {"id": org["id"], "name": org["name"], "role": org["role"]}
+                for org in organizations
+            ],
+            "permissions": permissions
+        }
+        return roles_data
+
+    @staticmethod
+    def invalidate_user_roles(clerk_user_id: Optional[str] = None) -> None:
+        """Drop cached role data for one user, or for everyone if no user is given"""
+        # Forgetting in-flight fetches keeps their possibly stale results out of the cache
+        if clerk_user_id:
+            _user_roles_cache.invalidate(clerk_user_id)
+            _user_roles_inflight.forget(clerk_user_id)
+        else:
+            _user_roles_cache.clear()
+            _user_roles_inflight.clear()
+
+
+def _cache_user_roles(clerk_user_id: str, roles: Optional[Dict[str, Any]]) -> None:
+    """Cache a completed role fetch; SingleFlight skips fetches invalidated while running"""
+    if roles is not None:
+        _user_roles_cache.set(clerk_user_id, roles)
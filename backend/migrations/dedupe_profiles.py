@@ -0,0 +1,115 @@
+"""
+Remove duplicate profiles ahead of the unique profiles.clerk_user_id index
+
+Profiles used to be created with a read followed by an insert, so two
+concurrent first logins could both insert one. The unique index on
+clerk_user_id cannot be built while such duplicates exist.
+
+The script:
+1. Groups profiles by clerk_user_id and finds users with more than one
+2. Keeps each user's oldest profile (lowest _id). find_one and update_one
+   by clerk_user_id have been resolving to that document, so it is the one
+   the app has been reading and editing
+3. Deletes the other profiles
+4. Builds the unique index once no duplicates remain
+5. Is idempotent - safe to run multiple times
+
+Run it before deploying a build that creates the index.
+
+Usage:
+    python -m migrations.dedupe_profiles dry_run
+    python -m migrations.dedupe_profiles migrate
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from typing import Any, Dict, List
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.mongodb import close_mongo_connection, connect_to_mongo, get_database
+from app.repositories.profile_repository import ProfileRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def find_duplicate_profiles(collection) -> List[Dict[str, Any]]:
+    """
+    Find every clerk_user_id with more than one profile.
+
+    Returns:
+        One entry per duplicated user: {"_id": clerk_user_id, "ids": [...]},
+        with ids in ascending _id order so the first is the one to keep
+    """
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": "$clerk_user_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    return await collection.aggregate(pipeline).to_list(length=None)
+
+
+async def dedupe_profiles(collection, dry_run: bool = True) -> int:
+    """
+    Delete all but the oldest profile of each user.
+
+    Args:
+        collection: The profiles collection
+        dry_run: Only report what would be deleted
+
+    Returns:
+        Number of profiles deleted (or that would be deleted)
+    """
+    removed = 0
+    for group in await find_duplicate_profiles(collection):
+        keep, *extra = group["ids"]
+        logger.info(f"User {group['_id']}: keeping profile {keep}, removing {len(extra)} duplicate(s) {extra}")
+        if not dry_run:
+            await collection.delete_many({"_id": {"$in": extra}})
+        removed += len(extra)
+    return removed
+
+
+async def run(dry_run: bool) -> None:
+    await connect_to_mongo()
+    try:
+        repository = ProfileRepository()
+        collection = get_database()[repository.collection_name]
+        removed = await dedupe_profiles(collection, dry_run=dry_run)
+        if dry_run:
+            logger.info(f"🔍 Dry run: {removed} duplicate profile(s) would be removed")
+            return
+        logger.info(f"✅ Removed {removed} duplicate profile(s)")
+        await repository.ensure_indexes()
+        logger.info("✅ Unique profiles.clerk_user_id index ensured")
+    finally:
+        await close_mongo_connection()
+
+
+def main():
+    """Main function to run migration commands"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Remove duplicate profiles per Clerk user")
+    parser.add_argument("command", choices=["migrate", "dry_run"],
+                        help="Migration command to run")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        asyncio.run(run(dry_run=args.command == "dry_run"))
+    except Exception as e:
+        logger.error(f"Command failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
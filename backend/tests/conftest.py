@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Tests import the app package the same way uvicorn does, from backend/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Settings are read at import time; give the required ones harmless values
+os.environ.setdefault("DATABASE_URL", "mongodb://localhost:27017/arete_test")
+os.environ.setdefault("CLERK_SECRET_KEY", "sk_test_dummy")
+os.environ.setdefault("CLERK_WEBHOOK_SECRET", "whsec_dGVzdA==")
@@ -0,0 +1,61 @@
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_profile_service
+from app.api.v1.webhooks import clerk
+from app.main import app
+
+
+class FakeProfileService:
+    fail = False
+    synced = []
+
+    async def sync_user_role_from_clerk(self, clerk_user_id):
+        if self.fail:
+            raise RuntimeError("Clerk unavailable")
+        self.synced.append(clerk_user_id)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(clerk, "verify_webhook_signature", lambda payload, headers: True)
+    monkeypatch.setattr(clerk, "get_database", lambda: object())
+    monkeypatch.setattr(FakeProfileService, "fail", False)
+    monkeypatch.setattr(FakeProfileService, "synced", [])
+    app.dependency_overrides[get_profile_service] = FakeProfileService
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _deliver(client, event_type, data):
+    return client.post("/api/v1/webhooks/clerk", content=orjson.dumps({"type": event_type, "data": data}))
+
+
+def test_role_sync_runs_before_acknowledging(client):
+    response = _deliver(client, "session.created", {"user_id": "user_123"})
+
+    assert response.status_code == 200
+    assert FakeProfileService.synced == ["user_123"]
+
+
+def test_failed_role_sync_is_not_acknowledged(client):
+    FakeProfileService.fail = True
+
+    response = _deliver(client, "user.updated", {"id": "user_123"})
+
+    # Non-2xx makes Svix redeliver the event
+    assert response.status_code == 500
+
+
+def test_organization_events_do_not_touch_profiles(client):
+    response = _deliver(client, "organization.created", {"id": "org_1", "name": "Coaching Co"})
+
+    assert response.status_code == 200
+    assert FakeProfileService.synced == []
+
+
+def test_membership_event_without_public_user_data_is_acknowledged(client):
+    response = _deliver(client, "organizationMembership.deleted", {"id": "orgmem_1", "public_user_data": None})
+
+    assert response.status_code == 200
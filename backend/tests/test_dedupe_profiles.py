@@ -0,0 +1,47 @@
+import asyncio
+
+from migrations.dedupe_profiles import dedupe_profiles
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeProfiles:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def aggregate(self, pipeline):
+        groups = {}
+        for doc in sorted(self.docs, key=lambda d: d["_id"]):
+            groups.setdefault(doc["clerk_user_id"], []).append(doc["_id"])
+        return FakeCursor([{"_id": uid, "ids": ids, "count": len(ids)} for uid, ids in groups.items() if len(ids) > 1])
+
+    async def delete_many(self, query):
+        doomed = set(query["_id"]["$in"])
+        self.docs = [d for d in self.docs if d["_id"] not in doomed]
+
+
+DOCS = [
+    {"_id": 3, "clerk_user_id": "user_a"},
+    {"_id": 1, "clerk_user_id": "user_a"},
+    {"_id": 2, "clerk_user_id": "user_b"},
+]
+
+
+def test_dry_run_reports_duplicates_without_deleting():
+    profiles = FakeProfiles(list(DOCS))
+
+    assert asyncio.run(dedupe_profiles(profiles, dry_run=True)) == 1
+    assert len(profiles.docs) == 3
+
+
+def test_migrate_keeps_each_users_oldest_profile():
+    profiles = FakeProfiles(list(DOCS))
+
+    assert asyncio.run(dedupe_profiles(profiles, dry_run=False)) == 1
+    assert sorted(d["_id"] for d in profiles.docs) == [1, 2]
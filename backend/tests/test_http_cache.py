@@ -0,0 +1,26 @@
+from starlette.requests import Request
+
+from app.core.http_cache import compute_etag, etag_json_response
+
+
+def _request(headers=None):
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def test_etag_response_requires_revalidation_per_caller():
+    response = etag_json_response(_request(), {"role": "coach"})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["vary"] == "Authorization"
+
+
+def test_matching_etag_returns_304_with_same_policy():
+    etag = compute_etag(b'{"role":"coach"}')
+
+    response = etag_json_response(_request({"If-None-Match": etag}), {"role": "coach"})
+
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["vary"] == "Authorization"
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_current_user_clerk_id, get_reflection_repository
+from app.main import app
+from app.repositories.journey.reflection_repository import ReflectionSourceRepository
+
+
+USER_ID = "user_123"
+FULL_TEXT = "A long reflection. " * 40
+
+
+def _project(doc, include_content):
+    if include_content:
+        return dict(doc)
+    return {k: v for k, v in doc.items() if k not in ("content", "content_uri")}
+
+
+class FakeReflectionRepository(ReflectionSourceRepository):
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def get_feed_page(self, user_id, skip=0, limit=20, include_content=False):
+        return [_project(doc, include_content) for doc in self.docs]
+
+    async def count_for_user(self, user_id):
+        return len(self.docs)
+
+    async def get_insights_projected(self, user_id, skip=0, limit=50, preview_length=201, include_content=False):
+        return [_project(doc, include_content) for doc in self.docs[skip:skip + limit]]
+
+
+@pytest.fixture
+def client(tmp_path):
+    stored = tmp_path / "reflection.txt"
+    stored.write_text(FULL_TEXT, encoding="utf-8")
+    now = datetime(2024, 5, 1, 12, 0, 0)
+    docs = [
+        {"_id": "r1", "title": "Uploaded", "preview": FULL_TEXT[:160], "content": "",
+         "content_uri": str(stored), "created_at": now, "updated_at": now},
+        {"_id": "r2", "title": "Typed", "preview": "Short note", "content": "Short note",
+         "created_at": now, "updated_at": now},
+    ]
+    app.dependency_overrides[get_current_user_clerk_id] = lambda: {"clerk_user_id": USER_ID}
+    app.dependency_overrides[get_reflection_repository] = lambda: FakeReflectionRepository(docs)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_feed_serves_previews_without_loading_content(client, monkeypatch):
+    async def no_reads(docs):
+        raise AssertionError("list views must not read stored content")
+
+    monkeypatch.setattr(FakeReflectionRepository, "with_full_content", staticmethod(no_reads))
+
+    items = client.get("/api/v1/reflections/journey/feed").json()["items"]
+
+    assert items[0]["content"] is None
+    assert items[0]["preview"] == FULL_TEXT[:160]
+
+
+def test_feed_returns_full_content_when_asked(client):
+    items = client.get("/api/v1/reflections/journey/feed?include_content=true").json()["items"]
+
+    assert items[0]["content"] == FULL_TEXT
+    assert items[0]["preview"] == FULL_TEXT[:160]
+    assert items[1]["content"] == "Short note"
+
+
+def test_insights_listing_is_paginated_and_serves_previews(client):
+    data = client.get("/api/v1/reflections/insights?skip=1&limit=1").json()["data"]
+
+    assert [i["id"] for i in data["insights"]] == ["r2"]
+    assert data["insights"][0]["content"] is None
+    assert data["insights"][0]["preview"] == "Short note"
+    assert data["pagination"] == {"total_count": 2, "skip": 1, "limit": 1}
+
+
+def test_insights_listing_returns_full_content_when_asked(client):
+    insights = client.get("/api/v1/reflections/insights?include_content=true").json()["data"]["insights"]
+
+    assert insights[0]["content"] == FULL_TEXT
+    assert insights[0]["preview"] == FULL_TEXT[:160]
+    assert insights[0]["summary"] == FULL_TEXT[:150] + "..."
+
+
+def test_insights_listing_keeps_empty_strings_for_missing_timestamps(client):
+    undated = {"_id": "r3", "title": "Legacy", "preview": "Old note", "content": "Old note"}
+    app.dependency_overrides[get_reflection_repository] = lambda: FakeReflectionRepository([undated])
+
+    insight = client.get("/api/v1/reflections/insights").json()["data"]["insights"][0]
+
+    assert insight["created_at"] == ""
+    assert insight["updated_at"] == ""
@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import org_optional
+from app.api.v1.endpoints.entries import MAX_ENTRY_FILE_SIZE
+from app.main import app
+
+
+ORIGIN = "https://app.example.com"
+
+
+def test_oversized_upload_gets_413_with_cors_headers():
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/entries/upload",
+        content=b"x",
+        headers={"Origin": ORIGIN, "Content-Length": str(MAX_ENTRY_FILE_SIZE * 2)},
+    )
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "File size must be less than 5MB"}
+    assert "access-control-allow-origin" in response.headers
+
+
+def test_unhandled_error_gets_500_with_cors_headers():
+    def broken_auth():
+        raise RuntimeError("boom")
+
+    app.dependency_overrides[org_optional] = broken_auth
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        response = client.get("/api/v1/test/org-optional", headers={"Origin": ORIGIN})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+    assert "access-control-allow-origin" in response.headers
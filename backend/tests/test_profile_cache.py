@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from pymongo import ReturnDocument
+
+from app.api.v1.deps import get_profile_service, org_optional
+from app.db import redis as redis_cache
+from app.main import app
+from app.repositories import profile_repository
+from app.repositories.profile_repository import ProfileRepository, profile_cache_key
+from app.services.profile_service import ProfileService
+
+
+USER_ID = "user_123"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, b"0")) + 1).encode()
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+class FakeProfiles:
+    def __init__(self):
+        now = datetime.utcnow()
+        self.doc = {
+            "_id": ObjectId(), "clerk_user_id": USER_ID, "first_name": "Ada", "last_name": "Lovelace",
+            "created_at": now, "updated_at": now,
+        }
+
+    async def find_one(self, query):
+        return dict(self.doc) if query["clerk_user_id"] == USER_ID else None
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        assert return_document == ReturnDocument.AFTER
+        self.doc.update(update["$set"])
+        return dict(self.doc)
+
+
+class NoOrganizations:
+    async def get_user_organizations(self, clerk_user_id):
+        return []
+
+
+def offline_profile_service():
+    service = ProfileService()
+    service.clerk_org_service = NoOrganizations()
+    return service
+
+
+@pytest.fixture
+def fake_stores(monkeypatch):
+    fake_redis = FakeRedis()
+    profiles = FakeProfiles()
+    monkeypatch.setattr(redis_cache, "get_redis", lambda: fake_redis)
+    monkeypatch.setattr(profile_repository, "get_database", lambda: {"profiles": profiles})
+    return fake_redis, profiles
+
+
+def test_profile_update_invalidates_cached_me_profile(fake_stores):
+    app.dependency_overrides[org_optional] = lambda: {"clerk_user_id": USER_ID}
+    app.dependency_overrides[get_profile_service] = offline_profile_service
+    try:
+        client = TestClient(app)
+        before = client.get("/api/v1/users/me/profile")
+        updated = client.put("/api/v1/users/me/profile", json={"first_name": "Grace"})
+        after = client.get("/api/v1/users/me/profile")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert before.json()["first_name"] == "Ada"
+    assert updated.status_code == 200
+    assert after.json()["first_name"] == "Grace"
+
+
+def test_read_overlapping_a_write_cannot_cache_stale_profile(fake_stores):
+    fake_redis, _ = fake_stores
+
+    async def scenario():
+        # A reader resolves its key, then a write lands before it caches
+        reader_key = await profile_cache_key(USER_ID)
+        await ProfileRepository().update_profile_by_clerk_id(USER_ID, {"first_name": "Grace"})
+        await redis_cache.cache_set(reader_key, b'{"first_name":"Ada"}', 300)
+        return await profile_cache_key(USER_ID)
+
+    current_key = asyncio.run(scenario())
+
+    assert fake_redis.values.get(current_key) is None
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from app.api.v1.deps import get_profile_service, org_optional
+from app.api.v1.endpoints import users as users_endpoint
+from app.db import indexes
+from app.main import app
+from app.models.profile import Profile
+from app.repositories import profile_repository
+from app.services import profile_service as profile_service_module
+from app.services.profile_service import ProfileService
+
+
+USER_ID = "user_123"
+
+
+class DuplicateProfileCollection:
+    async def insert_one(self, document):
+        raise DuplicateKeyError("E11000 duplicate key error collection: profiles")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    database = {"profiles": DuplicateProfileCollection()}
+    monkeypatch.setattr(profile_repository, "get_database", lambda: database)
+    app.dependency_overrides[org_optional] = lambda: {"clerk_user_id": USER_ID}
+    app.dependency_overrides[get_profile_service] = ProfileService
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_duplicate_profile_creation_returns_409(client):
+    response = client.post(
+        "/api/v1/users/me/profile",
+        json={"first_name": "Ada", "last_name": "Lovelace", "client_data": {"background": "Engineer", "challenges": []}},
+    )
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Profile already exists"}
+
+
+STORED_PROFILE = Profile(id=str(ObjectId()), clerk_user_id=USER_ID, first_name="Ada", last_name="Lovelace")
+
+
+class StoredProfileService:
+    async def get_profile_by_clerk_id(self, clerk_user_id):
+        return STORED_PROFILE
+
+
+def test_me_profile_is_revalidated_on_every_use():
+    app.dependency_overrides[org_optional] = lambda: {"clerk_user_id": USER_ID}
+    app.dependency_overrides[get_profile_service] = StoredProfileService
+    try:
+        client = TestClient(app)
+        first = client.get("/api/v1/users/me/profile")
+        second = client.get("/api/v1/users/me/profile", headers={"If-None-Match": first.headers["etag"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert "Authorization" in first.headers["vary"]
+    assert second.status_code == 304
+
+
+def test_profile_unique_index_failure_is_logged_without_blocking_startup(monkeypatch, caplog):
+    async def no_op(self):
+        return None
+
+    async def duplicate_profiles(self):
+        raise OperationFailure("E11000 duplicate key error; index build failed")
+
+    monkeypatch.setattr(indexes, "get_database", lambda: object())
+    monkeypatch.setattr(indexes.InsightRepository, "ensure_indexes", no_op)
+    monkeypatch.setattr(indexes.ReflectionSourceRepository, "__init__", lambda self: None)
+    monkeypatch.setattr(indexes.ReflectionSourceRepository, "ensure_indexes", no_op)
+    monkeypatch.setattr(indexes.ReflectionSourceRepository, "ensure_content_hash_index", no_op)
+    monkeypatch.setattr(indexes.ProfileRepository, "ensure_indexes", duplicate_profiles)
+
+    asyncio.run(indexes.ensure_indexes())
+
+    critical = [r for r in caplog.records if r.levelname == "CRITICAL"]
+    assert len(critical) == 1
+    assert "migrations.dedupe_profiles" in critical[0].getMessage()
+
+
+def test_query_index_failure_does_not_block_startup(monkeypatch):
+    built = []
+
+    async def broken(self):
+        raise OperationFailure("index build interrupted")
+
+    async def record(self):
+        built.append(type(self).__name__)
+
+    monkeypatch.setattr(indexes, "get_database", lambda: object())
+    monkeypatch.setattr(indexes.InsightRepository, "ensure_indexes", broken)
+    monkeypatch.setattr(indexes.ReflectionSourceRepository, "__init__", lambda self: None)
+    monkeypatch.setattr(indexes.ReflectionSourceRepository, "ensure_indexes", record)
+    monkeypatch.setattr(indexes.ReflectionSourceRepository, "ensure_content_hash_index", record)
+    monkeypatch.setattr(indexes.ProfileRepository, "ensure_indexes", record)
+
+    asyncio.run(indexes.ensure_indexes())
+
+    assert built == ["ReflectionSourceRepository", "ReflectionSourceRepository", "ProfileRepository"]
+
+
+def test_new_coach_profile_clears_lookup_miss_without_a_clerk_call(monkeypatch):
+    deleted = []
+
+    class CreatingRepository:
+        async def create_profile(self, profile):
+            return profile
+
+    class NoClerkUsers:
+        def get_user(self, clerk_user_id):
+            raise AssertionError("the email comes from the request, not Clerk")
+
+    async def record_delete(*keys):
+        deleted.extend(keys)
+
+    monkeypatch.setattr(profile_service_module, "cache_delete", record_delete)
+    service = ProfileService.__new__(ProfileService)
+    service.profile_repository = CreatingRepository()
+    service.user_service = NoClerkUsers()
+
+    asyncio.run(service.create_profile(
+        USER_ID, {"first_name": "Ada", "coach_data": {}}, email=" Ada@Example.com "
+    ))
+
+    assert deleted == ["notcoach:ada@example.com"]
+
+
+def test_verify_coach_echoes_the_email_as_sent(monkeypatch):
+    class CoachDirectory:
+        async def get_coach_by_email(self, email):
+            assert email == "coach@example.com"
+            return object(), Profile(clerk_user_id="coach_1", first_name="Grace", last_name="Hopper", coach_data={})
+
+    async def no_cached_miss(key):
+        return None
+
+    monkeypatch.setattr(users_endpoint, "cache_get", no_cached_miss)
+    monkeypatch.setattr(type(users_endpoint.settings), "coach_whitelist_set", frozenset({"coach@example.com"}))
+    app.dependency_overrides[get_profile_service] = CoachDirectory
+    try:
+        response = TestClient(app).post(
+            "/api/v1/users/access/verify-coach-for-client", json={"coach_email": " Coach@Example.com"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["coach_email"] == " Coach@Example.com"
@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.api.v1.endpoints import reflections
+from app.models.journey.enums import ProcessingStatus
+
+
+REFLECTION_ID = "64b7f0c2a1b2c3d4e5f60718"
+USER_ID = "user_123"
+
+
+class FakeReflectionRepository:
+    def __init__(self, fail_completed_update=False):
+        self.fail_completed_update = fail_completed_update
+        self.updates = []
+
+    async def get_by_id(self, id):
+        return SimpleNamespace(id=id, user_id=USER_ID, title="notes.txt", file_path="/tmp/notes.txt")
+
+    async def update(self, id, data):
+        self.updates.append(dict(data))
+        if self.fail_completed_update and data.get("processing_status") == ProcessingStatus.COMPLETED:
+            return None
+        return SimpleNamespace(id=id, **data)
+
+
+class FakeInsightRepository:
+    def __init__(self, fail_create=False):
+        self.fail_create = fail_create
+        self.created = []
+        self.deleted_sources = []
+
+    async def delete_by_source_id(self, user_id, source_id):
+        self.deleted_sources.append(source_id)
+        self.created = [i for i in self.created if i.source_id != source_id]
+        return 0
+
+    async def create_many(self, insights):
+        if self.fail_create:
+            raise RuntimeError("insert failed")
+        for index, insight in enumerate(insights):
+            insight.id = f"insight_{index}"
+        self.created.extend(insights)
+        return insights
+
+
+class FakeFileStorageService:
+    def save_extracted_text(self, file_path, text):
+        return f"{file_path}.txt"
+
+
+async def fake_analyze(text):
+    return {
+        "title": "Weekly reflection",
+        "summary": "summary",
+        "categorized_insights": {
+            "Understanding Myself": [{"insight": "I plan better in the morning", "evidence": "notes", "confidence": 0.9}]
+        },
+    }
+
+
+def _run(monkeypatch, reflection_repo, insight_repo):
+    monkeypatch.setattr(reflections, "ReflectionSourceRepository", lambda: reflection_repo)
+    monkeypatch.setattr(reflections, "InsightRepository", lambda: insight_repo)
+    monkeypatch.setattr(reflections, "FileStorageService", FakeFileStorageService)
+    monkeypatch.setattr(reflections, "extract_text_with_counts", lambda path: ("some text", 2, 9))
+    monkeypatch.setattr(reflections, "analyze_text_for_insights", fake_analyze)
+    asyncio.run(reflections._process_uploaded_reflection(REFLECTION_ID))
+
+
+def test_insight_failure_never_marks_reflection_completed(monkeypatch):
+    reflection_repo = FakeReflectionRepository()
+    insight_repo = FakeInsightRepository(fail_create=True)
+
+    _run(monkeypatch, reflection_repo, insight_repo)
+
+    statuses = [u.get("processing_status") for u in reflection_repo.updates]
+    assert ProcessingStatus.COMPLETED not in statuses
+    assert statuses[-1] == ProcessingStatus.FAILED
+    assert reflection_repo.updates[-1]["insight_ids"] == []
+
+
+def test_failed_completed_write_removes_created_insights(monkeypatch):
+    reflection_repo = FakeReflectionRepository(fail_completed_update=True)
+    insight_repo = FakeInsightRepository()
+
+    _run(monkeypatch, reflection_repo, insight_repo)
+
+    assert reflection_repo.updates[-1]["processing_status"] == ProcessingStatus.FAILED
+    assert insight_repo.created == []
+    assert REFLECTION_ID in insight_repo.deleted_sources
+
+
+def test_successful_run_links_insights_with_completed_status(monkeypatch):
+    reflection_repo = FakeReflectionRepository()
+    insight_repo = FakeInsightRepository()
+
+    _run(monkeypatch, reflection_repo, insight_repo)
+
+    final = reflection_repo.updates[-1]
+    assert final["processing_status"] == ProcessingStatus.COMPLETED
+    assert final["insight_ids"] == ["insight_0"]
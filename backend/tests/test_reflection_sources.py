@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_current_user_clerk_id, get_reflection_repository
+from app.main import app
+from app.models.journey.reflection import ReflectionSource
+from app.repositories.journey.reflection_repository import ReflectionSourceRepository
+
+
+USER_ID = "user_123"
+FULL_TEXT = "An uploaded reflection. " * 40
+
+
+class FakeReflectionRepository(ReflectionSourceRepository):
+    def __init__(self, reflections):
+        self.reflections = reflections
+
+    async def get_by_user_id(self, user_id):
+        return [r.model_copy() for r in self.reflections]
+
+    async def get_by_id(self, id):
+        return next((r.model_copy() for r in self.reflections if r.id == id), None)
+
+
+@pytest.fixture
+def client(tmp_path):
+    stored = tmp_path / "reflection.txt"
+    stored.write_text(FULL_TEXT, encoding="utf-8")
+    reflections = [
+        ReflectionSource(_id="r1", user_id=USER_ID, title="Uploaded", content="",
+                         content_uri=str(stored), content_excerpt=FULL_TEXT[:500]),
+        ReflectionSource(_id="r2", user_id="someone_else", title="Private", content="Not yours"),
+    ]
+    app.dependency_overrides[get_current_user_clerk_id] = lambda: {"clerk_user_id": USER_ID}
+    app.dependency_overrides[get_reflection_repository] = lambda: FakeReflectionRepository(reflections)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_list_returns_excerpt_without_storage_location(client):
+    listed = client.get("/api/v1/reflections/").json()
+
+    assert listed[0]["content"] == FULL_TEXT[:500]
+    assert "content_uri" not in listed[0]
+
+
+def test_detail_returns_full_text_without_storage_location(client):
+    detail = client.get("/api/v1/reflections/r1").json()
+
+    assert detail["content"] == FULL_TEXT
+    assert "content_uri" not in detail
+
+
+def test_detail_hides_other_users_reflections(client):
+    assert client.get("/api/v1/reflections/r2").status_code == 404
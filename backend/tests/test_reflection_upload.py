@@ -0,0 +1,100 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException, UploadFile
+from pymongo.errors import DuplicateKeyError
+from starlette.datastructures import Headers
+
+from app.api.v1.endpoints import reflections
+from app.models.journey.enums import ProcessingStatus
+
+
+USER_INFO = {"clerk_user_id": "user_123"}
+
+
+class FakeFileStorageService:
+    def __init__(self):
+        self.deleted = []
+
+    async def save_reflection_document(self, user_id, file):
+        return SimpleNamespace(path="/tmp/upload.txt", sha256="abc123", size=5)
+
+    def delete_file(self, path):
+        self.deleted.append(path)
+
+
+class RacingReflectionRepository:
+    """Loses the insert race; the winner may or may not still exist."""
+
+    def __init__(self, winner=None):
+        self.winner = winner
+        self.lookups = 0
+
+    async def get_by_content_hash(self, user_id, content_hash):
+        self.lookups += 1
+        # The first lookup runs before the insert and finds nothing
+        return None if self.lookups == 1 else self.winner
+
+    async def create(self, reflection):
+        raise DuplicateKeyError("E11000 duplicate key error")
+
+    async def update(self, id, data):
+        return None
+
+
+def _upload(reflection_repo, storage):
+    file = UploadFile(file=io.BytesIO(b"hello"), filename="notes.txt", headers=Headers({"content-type": "text/plain"}))
+    return asyncio.run(reflections.upload_reflection_document(
+        BackgroundTasks(), file, USER_INFO, reflection_repo, storage
+    ))
+
+
+def test_lost_race_with_deleted_winner_returns_409():
+    storage = FakeFileStorageService()
+
+    with pytest.raises(HTTPException) as exc_info:
+        _upload(RacingReflectionRepository(winner=None), storage)
+
+    assert exc_info.value.status_code == 409
+    assert storage.deleted == ["/tmp/upload.txt"]
+
+
+def test_lost_race_reuses_winning_reflection():
+    storage = FakeFileStorageService()
+    winner = SimpleNamespace(id="existing", processing_status=ProcessingStatus.COMPLETED)
+
+    result = _upload(RacingReflectionRepository(winner=winner), storage)
+
+    assert result is winner
+    assert storage.deleted == ["/tmp/upload.txt"]
+
+
+class ClaimingReflectionRepository:
+    """Lets the first claim on a failed reflection win, like the conditional update."""
+
+    def __init__(self):
+        self.claimed = False
+
+    async def claim_failed_for_retry(self, id):
+        won, self.claimed = not self.claimed, True
+        return won
+
+
+def test_concurrent_reuploads_of_failed_file_queue_one_retry():
+    repo = ClaimingReflectionRepository()
+    tasks = [BackgroundTasks(), BackgroundTasks()]
+
+    async def reupload_twice():
+        return await asyncio.gather(*(
+            reflections._reuse_existing_reflection(
+                SimpleNamespace(id="failed", processing_status=ProcessingStatus.FAILED, processing_errors="boom"),
+                "/tmp/upload.txt", repo, FakeFileStorageService(), background_tasks
+            )
+            for background_tasks in tasks
+        ))
+
+    asyncio.run(reupload_twice())
+
+    assert sum(len(t.tasks) for t in tasks) == 1
@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_current_user_id, get_invitation_service
+from app.main import app
+from app.services.clerk_invitation_service import _clerk_timestamp_to_iso
+
+
+COACH_ID = "user_coach"
+
+
+class FakeInvitationService:
+    async def get_coach_relationships(self, coach_user_id):
+        return {
+            "active_relationships": [{
+                "client_user_id": "user_client",
+                "client_name": "Ada Lovelace",
+                "client_email": None,
+                "relationship_status": "active",
+                "started_at": _clerk_timestamp_to_iso(1700000000000),
+                "clerk_membership_id": "orgmem_1",
+            }],
+            "pending_invitations": [],
+            "internal_note": "not part of the response model",
+        }
+
+
+def test_coach_relationships_match_the_declared_response_model():
+    app.dependency_overrides[get_current_user_id] = lambda: COACH_ID
+    app.dependency_overrides[get_invitation_service] = FakeInvitationService
+    try:
+        response = TestClient(app).get("/api/v1/relationships/coach")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"active_relationships", "pending_invitations"}
+    assert body["active_relationships"][0]["started_at"] == "2023-11-14T22:13:20+00:00"
+
+
+def test_clerk_timestamps_become_iso_strings():
+    assert _clerk_timestamp_to_iso(None) is None
+    assert _clerk_timestamp_to_iso(0) == "1970-01-01T00:00:00+00:00"
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core.cache import SingleFlight
+
+
+def test_concurrent_calls_share_one_run_and_report_the_result_once():
+    async def scenario():
+        flight = SingleFlight()
+        calls, results = [], []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return "value"
+
+        values = await asyncio.gather(*(flight.run("k", fetch, on_result=results.append) for _ in range(3)))
+        return values, calls, results
+
+    values, calls, results = asyncio.run(scenario())
+
+    assert values == ["value"] * 3
+    assert len(calls) == 1
+    assert results == ["value"]
+
+
+def test_forgotten_call_skips_on_result_and_later_callers_start_fresh():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls, results = [], []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return len(calls)
+
+        first = asyncio.create_task(flight.run("k", fetch, on_result=results.append))
+        await asyncio.sleep(0)
+        flight.forget("k")
+        second = asyncio.create_task(flight.run("k", fetch, on_result=results.append))
+        await asyncio.sleep(0)
+        release.set()
+        return await first, await second, calls, results
+
+    first, second, calls, results = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert results == [second]
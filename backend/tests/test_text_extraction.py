@@ -0,0 +1,37 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import text_extraction_service
+from app.services.text_extraction_service import TextExtractionService
+
+
+def test_read_text_fileobj_decodes_utf8():
+    service = TextExtractionService()
+    fileobj = io.BytesIO("café notes".encode("utf-8"))
+    fileobj.read()  # position left at the end, as after spooling
+
+    assert asyncio.run(service.read_text_fileobj(fileobj)) == "café notes"
+
+
+def test_read_text_fileobj_rejects_non_utf8():
+    service = TextExtractionService()
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.read_text_fileobj(io.BytesIO(b"\xff\xfe\x00bad")))
+
+
+def test_pdf_is_picked_by_content_type_not_filename(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(text_extraction_service, "_get_pdf_executor", lambda: executor)
+    monkeypatch.setattr(text_extraction_service, "_extract_text_from_pdf_bytes", lambda data: f"pdf:{len(data)}")
+    service = TextExtractionService()
+
+    try:
+        text = asyncio.run(service.extract_text_from_fileobj(io.BytesIO(b"%PDF-1.7 \xff"), "application/pdf"))
+    finally:
+        executor.shutdown()
+
+    assert text == "pdf:10"
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.v1 import deps
+from app.core import cache as cache_module
+
+
+class FakeOrganizationService:
+    fail = False
+    calls = 0
+
+    async def get_user_organizations(self, user_id):
+        FakeOrganizationService.calls += 1
+        if FakeOrganizationService.fail:
+            raise RuntimeError("Clerk unavailable")
+        return [{"id": "org_1", "name": "Practice", "role": "coach", "public_user_data": {}}]
+
+
+@pytest.fixture(autouse=True)
+def offline_auth(monkeypatch):
+    async def verify(token):
+        return {"sub": token.split(":")[0], "exp": time.time() + 60, "publicMetadata": {"primary_role": "client"}}
+
+    async def validate(*args, **kwargs):
+        return {}
+
+    monkeypatch.setattr(deps, "verify_clerk_jwt", verify)
+    monkeypatch.setattr(deps, "validate_user_session", validate)
+    monkeypatch.setattr(deps, "ClerkOrganizationService", FakeOrganizationService)
+    monkeypatch.setattr(FakeOrganizationService, "fail", False)
+    monkeypatch.setattr(FakeOrganizationService, "calls", 0)
+    deps._user_info_cache.clear()
+    deps._user_info_generations.clear()
+
+
+def _authenticate(token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(deps.get_current_user_clerk_id(None, credentials))
+
+
+def test_jwt_fallback_roles_are_not_cached():
+    FakeOrganizationService.fail = True
+    assert _authenticate("user_a:1")["primary_role"] == "client"
+
+    FakeOrganizationService.fail = False
+    assert _authenticate("user_a:1")["primary_role"] == "coach"
+    assert FakeOrganizationService.calls == 2
+
+
+def test_callers_cannot_modify_the_cached_entry():
+    first = _authenticate("user_a:1")
+    first["organization_roles"]["org_1"]["role"] = "admin"
+
+    assert _authenticate("user_a:1")["organization_roles"]["org_1"]["role"] == "coach"
+    assert FakeOrganizationService.calls == 1
+
+
+def test_invalidation_only_drops_that_users_entries():
+    _authenticate("user_a:1")
+    _authenticate("user_b:1")
+
+    deps.invalidate_user_info_cache("user_a")
+    _authenticate("user_a:1")
+    _authenticate("user_b:1")
+
+    assert FakeOrganizationService.calls == 3
+
+
+def test_generations_are_bounded_and_never_reused(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    deps.invalidate_user_info_cache("user_a")
+    first = deps._user_info_generation("user_a")
+    now[0] += 2 * deps.USER_INFO_CACHE_TTL_SECONDS + 1
+    assert deps._user_info_generation("user_a") == 0
+
+    deps.invalidate_user_info_cache("user_a")
+    assert deps._user_info_generation("user_a") > first
@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.deps import get_user_service
+from app.main import app
+from app.services import user_service as user_service_module
+from app.services.clerk_organization_service import ClerkOrganizationService
+from app.services.user_service import UserService
+
+
+USER_ID = "user_123"
+
+
+class FakeOrganizationService(ClerkOrganizationService):
+    calls = []
+
+    def __init__(self):
+        pass
+
+    async def get_user_organizations(self, user_id):
+        self.calls.append(user_id)
+        return [
+            {"id": "org_1", "name": "Practice", "role": "admin", "metadata": {"organization_type": "coach_practice"}},
+            {"id": "org_2", "name": "Acme", "role": "member", "metadata": {"organization_type": "client_company"}},
+        ]
+
+    async def get_organization_with_metadata(self, org_id):
+        raise AssertionError("organization metadata is embedded in the memberships")
+
+
+def test_roles_and_permissions_come_from_one_memberships_call(monkeypatch):
+    monkeypatch.setattr(user_service_module, "ClerkOrganizationService", FakeOrganizationService)
+    monkeypatch.setattr(FakeOrganizationService, "calls", [])
+    service = UserService()
+    service.get_user = lambda user_id: SimpleNamespace(public_metadata={}, email_addresses=[])
+
+    roles = asyncio.run(service._fetch_user_roles(USER_ID))
+
+    assert FakeOrganizationService.calls == [USER_ID]
+    assert roles["primary_role"] == "coach"
+    assert roles["roles"] == ["admin", "member"]
+    assert {"clients:invite", "org_settings:manage", "goals:manage"} <= set(roles["permissions"])
+
+
+def test_all_users_reports_the_total_count(monkeypatch):
+    class PagedUsers:
+        def get_all_users(self, limit, offset):
+            return [{"id": f"user_{offset + i}"} for i in range(limit)]
+
+        def count_users(self):
+            return 120
+
+    app.dependency_overrides[get_user_service] = PagedUsers
+    try:
+        response = TestClient(app).get(
+            "/api/v1/users/all?limit=2&offset=100", headers={"Origin": "http://localhost:3000"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [u["id"] for u in response.json()] == ["user_100", "user_101"]
+    assert response.headers["X-Total-Count"] == "120"
+    assert "X-Total-Count" in response.headers["Access-Control-Expose-Headers"]